@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark Helpers
+
+Timing, memory and result-file helpers shared by fibonacci_benchmark.py
+and graph_benchmark.py: timings come from time.perf_counter_ns after
+untimed warmup calls, peak memory from tracemalloc, and results are
+written as JSON or CSV and compared against an earlier run.
+"""
+
+import csv
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+# --- Configuration ---
+
+# Median slowdown (new / baseline) reported as a regression by compare_results
+REGRESSION_RATIO = 1.10
+
+# --- Main Script ---
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_call(func, warmup, repeats):
+    """Runs func warmup times untimed, then returns repeats timings in ns."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def peak_memory(func):
+    """Returns the peak traced allocation in bytes of a single call."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def write_results(rows, path):
+    """Writes rows as JSON (with run metadata) or CSV, chosen by extension."""
+    if path.endswith('.csv'):
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump({
+                'python': sys.version,
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': rows,
+            }, f, indent=2)
+
+
+def load_results(path):
+    """Reads rows written by write_results."""
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            return [
+                {**row, 'n': int(row['n']), 'median_ns': float(row['median_ns'])}
+                for row in csv.DictReader(f)
+            ]
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_results(baseline, rows, ratio=REGRESSION_RATIO):
+    """Returns (method, n, old, new) for every median slower than ratio."""
+    old = {(row['method'], row['n']): row['median_ns'] for row in baseline}
+    regressions = []
+    for row in rows:
+        key = (row['method'], row['n'])
+        if key in old and row['median_ns'] > old[key] * ratio:
+            regressions.append((row['method'], row['n'], old[key], row['median_ns']))
+    return regressions
@@ -0,0 +1,183 @@
+"""
+Test matrix for performance_analyzer.py.
+
+A matrix file lists the targets to measure, so new explorers and queries
+need no code change. JSON, TOML and (with PyYAML installed) YAML files
+are read, chosen by extension. In TOML:
+
+    runs = 5            # measured runs per test value
+    warmup = 1          # unrecorded requests per target and search type
+    concurrency = 12    # requests in flight across all targets
+
+    [test_data]
+    transaction = ["a1075db5...", "f4184fc5..."]
+    address = { file = "addresses.txt" }    # one value per line
+    block = 904512
+
+    [targets.Blockonomics]
+    url = "https://www.blockonomics.co/api/search?q={value}"
+    concurrency = 4     # requests in flight for this target
+
+    [targets."Blockchain.com"]
+    urls = { transaction = "https://www.blockchain.com/btc/tx/{value}",
+             address = "https://www.blockchain.com/btc/address/{value}" }
+    runs = 3
+
+A target's url template applies to every search type and urls gives
+per-type templates; {value} and {search_type} are substituted, and a
+target is only run for the types it has a template for. A target may
+carry its own test_data, merged over the shared one. runs, warmup and
+concurrency default to the top-level settings.
+
+Nothing is materialized up front: value files are read line by line as
+the jobs are pulled, so a matrix with thousands of values streams through
+the engine.
+"""
+
+import json
+import os
+
+# --- Configuration ---
+
+MATRIX_FORMATS = ('.json', '.toml', '.yaml', '.yml')
+
+# Top-level keys passed on to the caller as run settings
+SETTINGS = ('runs', 'warmup', 'concurrency', 'per_target_concurrency')
+
+
+def _iter_values(source):
+    """Lazily yields the test values of one value source."""
+    if isinstance(source, dict):
+        with open(source['file']) as f:
+            for line in f:
+                value = line.strip()
+                if value and not value.startswith('#'):
+                    yield value
+    elif isinstance(source, (list, tuple)):
+        for value in source:
+            yield str(value)
+    else:
+        yield str(source)
+
+
+class Target:
+    """One explorer to measure: URL templates, test values and run counts."""
+
+    def __init__(self, name, urls, test_data, runs, warmup=0, concurrency=None):
+        self.name = name
+        self.urls = urls
+        self.test_data = test_data
+        self.runs = runs
+        self.warmup = warmup
+        self.concurrency = concurrency
+
+    @property
+    def search_types(self):
+        """Search types that have both test values and a URL template."""
+        return [search_type for search_type in self.test_data if search_type in self.urls]
+
+    def values(self, search_type):
+        return _iter_values(self.test_data[search_type])
+
+    def url(self, search_type, value):
+        return self.urls[search_type].format(value=value, search_type=search_type)
+
+    def jobs(self, skip=None, more=None):
+        """
+        Lazily yields (search_type, value, run, url, warmup) jobs.
+
+        Every value of a search type gets runs measured runs, numbered on
+        from the previous value's so (search type, run) stays unique. The
+        first value is preceded by warmup jobs with run 0 and warmup set.
+        Measured runs for which skip(search_type, run) is true are left out.
+
+        With more, a search type keeps cycling through its values after the
+        configured runs for as long as more(search_type, run) is true, where
+        run is the last run handed out.
+        """
+        for search_type in self.search_types:
+            run = 0
+            for value in self.values(search_type):
+                url = self.url(search_type, value)
+                if run == 0:
+                    for _ in range(self.warmup):
+                        yield search_type, value, 0, url, True
+                for _ in range(self.runs):
+                    run += 1
+                    if skip is not None and skip(search_type, run):
+                        continue
+                    yield search_type, value, run, url, False
+            while more is not None and run and more(search_type, run):
+                for value in self.values(search_type):
+                    if not more(search_type, run):
+                        break
+                    run += 1
+                    if skip is not None and skip(search_type, run):
+                        continue
+                    yield search_type, value, run, self.url(search_type, value), False
+
+
+def _read_matrix(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as f:
+            return json.load(f)
+    if extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Reading a YAML matrix requires PyYAML (pip install pyyaml)")
+        with open(path) as f:
+            return yaml.safe_load(f)
+    raise ValueError(f"Matrix file must be one of {MATRIX_FORMATS}, got {path!r}")
+
+
+def _value_sources(test_data, base_dir):
+    """Validates value sources and resolves value files against base_dir."""
+    sources = {}
+    for search_type, source in (test_data or {}).items():
+        if isinstance(source, dict):
+            if 'file' not in source:
+                raise ValueError(f"Value source for {search_type!r} needs a 'file' key")
+            source = {**source, 'file': os.path.join(base_dir, source['file'])}
+        sources[search_type] = source
+    return sources
+
+
+def parse_matrix(data, base_dir='.', runs=5, warmup=0):
+    """
+    Builds targets from a parsed matrix document.
+
+    runs and warmup are used where the document sets neither. Returns
+    (targets, settings), where settings holds the top-level SETTINGS
+    present in the document.
+    """
+    if not isinstance(data, dict) or not data.get('targets'):
+        raise ValueError("Matrix must define at least one target under 'targets'")
+    settings = {key: data[key] for key in SETTINGS if key in data}
+    runs = settings.get('runs', runs)
+    warmup = settings.get('warmup', warmup)
+    shared = _value_sources(data.get('test_data'), base_dir)
+
+    targets = []
+    for name, spec in data['targets'].items():
+        test_data = {**shared, **_value_sources(spec.get('test_data'), base_dir)}
+        urls = dict.fromkeys(test_data, spec['url']) if 'url' in spec else {}
+        urls.update(spec.get('urls', {}))
+        if not urls:
+            raise ValueError(f"Target {name!r} needs a 'url' or 'urls' template")
+        targets.append(Target(name, urls, test_data, spec.get('runs', runs),
+                              spec.get('warmup', warmup), spec.get('concurrency')))
+    return targets, settings
+
+
+def load_matrix(path, runs=5, warmup=0):
+    """Reads a matrix file; value files are resolved relative to it."""
+    return parse_matrix(_read_matrix(path), os.path.dirname(os.path.abspath(path)), runs, warmup)
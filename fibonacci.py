@@ -5,10 +5,79 @@ Fibonacci Series Generator
 This module provides multiple implementations to generate Fibonacci numbers:
 1. Iterative approach (most efficient)
 2. Recursive approach (simple but inefficient for large numbers)
-3. Memoized recursive approach (efficient recursive solution)
+3. Memoized approach (persistent, bounded memo filled bottom-up)
 4. Generator function (memory efficient for sequences)
+5. Fast doubling (O(log n) big-integer multiplications for large n)
 """
 
+import argparse
+import bisect
+import decimal
+import functools
+import io
+import json
+import math
+import os
+import struct
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this index the plain iterative loop beats fast doubling, because
+# the additions are on small ints and there is no multiplication overhead.
+FAST_DOUBLING_THRESHOLD = 32
+
+# Size cap for the shared memo used by fibonacci_memoized
+DEFAULT_MEMO_BYTES = 16 * 1024 * 1024
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _build_word_table():
+    table = [0, 1]
+    while table[-1] + table[-2] < 2 ** 64:
+        table.append(table[-1] + table[-2])
+    return tuple(table)
+
+
+# F(0)..F(93): every Fibonacci number that fits in a uint64
+# (F(92) is the last one that fits in an int64)
+FIB_WORD_TABLE = _build_word_table()
+_FIB_WORD_SET = frozenset(FIB_WORD_TABLE)
+_FIB_WORD_ARRAYS = None
+
+# fibonacci_many walks forward between indexes up to this gap and jumps
+# with fast doubling beyond it; each worker gets several runs to balance load
+MAX_WALK_GAP = 2048
+RUNS_PER_WORKER = 4
+
+# Moduli with cached Pisano periods, and the largest modulus for which
+# fibonacci_mod factors m to reduce n by its period
+PISANO_CACHE_SIZE = 4096
+PISANO_MAX_MODULUS = 2 ** 40
+
+# F(2), F(3), ... for Zeckendorf decomposition, extended on demand
+_ZECKENDORF_TABLE = list(FIB_WORD_TABLE[2:])
+
+# Cached codewords for fibonacci_encode, and values per NumPy encode pass
+CODEWORD_CACHE_SIZE = 65536
+CODEC_CHUNK_SIZE = 65536
+
+# Constants for fibonacci_digit_count, and the CLI output buffer size.
+# The float error of n*log10(phi) grows with n, so above DIGIT_COUNT_FLOAT_MAX
+# the estimate is recomputed in Decimal with digits to spare
+_LOG10_PHI = math.log10((1 + math.sqrt(5)) / 2)
+_LOG10_SQRT5 = math.log10(math.sqrt(5))
+DIGIT_COUNT_FLOAT_MAX = 10 ** 8
+DIGIT_COUNT_GUARD_DIGITS = 30
+CLI_BUFFER_SIZE = 1 << 16
+
+# Length prefix used by fibonacci_export's binary format
+_LENGTH_PREFIX = struct.Struct('<I')
+
 
 def fibonacci_iterative(n):
     """
@@ -56,31 +125,174 @@ def fibonacci_recursive(n):
     return fibonacci_recursive(n - 1) + fibonacci_recursive(n - 2)
 
 
+class FibonacciMemo:
+    """
+    Bounded, least-recently-used store of Fibonacci numbers.
+    
+    Entries are evicted oldest-first once the total size of the stored
+    ints (as reported by sys.getsizeof) exceeds max_bytes. Missing values
+    are filled bottom-up from the highest consecutive pair filled so far,
+    or from a pair found by fast doubling when n lies below that pair or it
+    was evicted, so no recursion is involved and large n cannot hit the
+    recursion limit.
+    
+    Attributes:
+        max_bytes (int): Upper bound on the total size of stored ints
+        hits (int): Lookups answered directly from the store
+        misses (int): Lookups that had to compute new values
+        evictions (int): Entries dropped to stay under max_bytes
+    """
+    
+    def __init__(self, max_bytes=DEFAULT_MEMO_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._store = OrderedDict()
+        self._top = 1
+    
+    def __len__(self):
+        return len(self._store)
+    
+    def __contains__(self, n):
+        return n in self._store
+    
+    def info(self):
+        """
+        Report cache statistics.
+        
+        Returns:
+            dict: hits, misses, evictions, entries and nbytes
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._store),
+            'nbytes': self.nbytes,
+        }
+    
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        self._store.clear()
+        self._top = 1
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+    
+    def get(self, n):
+        """
+        Return F(n), computing and storing any missing values.
+        
+        Args:
+            n (int): Position in Fibonacci sequence (0-indexed)
+            
+        Returns:
+            int: The nth Fibonacci number
+        """
+        if n <= 1:
+            return n
+        
+        store = self._store
+        if n in store:
+            self.hits += 1
+            store.move_to_end(n)
+            return store[n]
+        
+        self.misses += 1
+        k, a, b = self._seed(n)
+        for i in range(k + 1, n + 1):
+            a, b = b, a + b
+            self._put(i, b)
+        if n > self._top or self._pair(self._top) is None:
+            self._top = n
+        return b
+    
+    def _pair(self, k):
+        """Return (F(k-1), F(k)) from the store, or None if either is missing."""
+        store = self._store
+        if k == 1:
+            return 0, 1
+        if k in store and (k == 2 or k - 1 in store):
+            return store[k - 1] if k > 2 else 1, store[k]
+        return None
+    
+    def _seed(self, n):
+        """Return (k, F(k-1), F(k)) with k < n to fill upwards from."""
+        k = self._top
+        pair = self._pair(k) if k < n else None
+        if pair is not None:
+            return (k,) + pair
+        # n is below the filled range, or its top pair was evicted
+        previous, current = fibonacci_pair(n - 2)
+        self._put(n - 1, current)
+        return n - 1, previous, current
+    
+    def _put(self, n, value):
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        store = self._store
+        if n in store:
+            store.move_to_end(n)
+            return
+        store[n] = value
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = store.popitem(last=False)
+            self.nbytes -= sys.getsizeof(evicted)
+            self.evictions += 1
+
+
+# Shared by every fibonacci_memoized call that does not pass its own memo
+_memo = FibonacciMemo()
+
+
 def fibonacci_memoized(n, memo=None):
     """
-    Calculate the nth Fibonacci number using memoized recursion.
+    Calculate the nth Fibonacci number using a persistent memo.
+    
+    Values are filled bottom-up into a module-level FibonacciMemo that is
+    shared across calls, so repeated lookups are O(1) and large n does not
+    recurse.
     
     Args:
         n (int): Position in Fibonacci sequence (0-indexed)
-        memo (dict): Memoization dictionary (used internally)
+        memo (FibonacciMemo or dict): Memo to use instead of the shared
+            one. A plain dict (the old contract) is filled bottom-up with
+            every F(i) up to n and is not bounded.
         
     Returns:
         int: The nth Fibonacci number
         
-    Time Complexity: O(n)
-    Space Complexity: O(n)
+    Time Complexity: O(1) for cached n, O(n) otherwise
+    Space Complexity: Bounded by the memo's max_bytes
     """
     if memo is None:
-        memo = {}
-    
-    if n in memo:
-        return memo[n]
-    
+        memo = _memo
+    if isinstance(memo, FibonacciMemo):
+        return memo.get(n)
+    if not isinstance(memo, MutableMapping):
+        raise TypeError(f"memo must be a FibonacciMemo or a dict, not {type(memo).__name__}")
     if n <= 1:
         return n
+    if n in memo:
+        return memo[n]
+    a, b = 0, 1
+    for i in range(2, n + 1):
+        a, b = b, a + b
+        memo[i] = b
+    return b
+
+
+def fibonacci_memo_info():
+    """
+    Report hit/miss/eviction counts of the shared memo.
     
-    memo[n] = fibonacci_memoized(n - 1, memo) + fibonacci_memoized(n - 2, memo)
-    return memo[n]
+    Returns:
+        dict: Statistics as returned by FibonacciMemo.info()
+    """
+    return _memo.info()
 
 
 def fibonacci_generator(n):
@@ -102,17 +314,67 @@ def fibonacci_generator(n):
         a, b = b, a + b
 
 
-def fibonacci_nth(n, method='iterative'):
+def fibonacci_pair(n):
+    """
+    Calculate the pair (F(n), F(n+1)) using the fast doubling identities.
+    
+    F(2k)   = F(k) * (2*F(k+1) - F(k))
+    F(2k+1) = F(k)^2 + F(k+1)^2
+    
+    Args:
+        n (int): Position in Fibonacci sequence (0-indexed)
+        
+    Returns:
+        tuple: (F(n), F(n+1))
+        
+    Time Complexity: O(log n) big-integer multiplications
+    Space Complexity: O(1)
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibonacci_fast_doubling(n):
+    """
+    Calculate the nth Fibonacci number using fast doubling.
+    
+    Args:
+        n (int): Position in Fibonacci sequence (0-indexed)
+        
+    Returns:
+        int: The nth Fibonacci number
+        
+    Time Complexity: O(log n) big-integer multiplications
+    Space Complexity: O(1)
+    """
+    return fibonacci_pair(n)[0]
+
+
+def fibonacci_nth(n, method='auto'):
     """
     Get the nth Fibonacci number using specified method.
     
     Args:
         n (int): Position in Fibonacci sequence (0-indexed)
-        method (str): Method to use ('iterative', 'recursive', 'memoized')
+        method (str): Method to use ('auto', 'iterative', 'recursive',
+            'memoized', 'fast_doubling'). 'auto' uses the iterative loop
+            below FAST_DOUBLING_THRESHOLD and fast doubling above it.
         
     Returns:
         int: The nth Fibonacci number
     """
+    if method == 'auto':
+        method = 'iterative' if n < FAST_DOUBLING_THRESHOLD else 'fast_doubling'
+    
     if method == 'iterative':
         if n <= 1:
             return n
@@ -124,16 +386,256 @@ def fibonacci_nth(n, method='iterative'):
         return fibonacci_recursive(n)
     elif method == 'memoized':
         return fibonacci_memoized(n)
+    elif method == 'fast_doubling':
+        return fibonacci_fast_doubling(n)
     else:
-        raise ValueError("Method must be 'iterative', 'recursive', or 'memoized'")
+        raise ValueError(
+            "Method must be 'auto', 'iterative', 'recursive', 'memoized', "
+            "or 'fast_doubling'"
+        )
+
+
+def _fibonacci_run(indexes):
+    """
+    Compute F(i) for a sorted run of indexes by walking forward.
+    
+    The walk is seeded with a fast-doubling jump to the first index and
+    re-seeded the same way whenever the gap to the next index exceeds
+    MAX_WALK_GAP, where a jump is cheaper than the additions it replaces.
+    """
+    values = []
+    current = indexes[0]
+    a, b = fibonacci_pair(current)
+    for i in indexes:
+        gap = i - current
+        if gap > MAX_WALK_GAP:
+            a, b = fibonacci_pair(i)
+        else:
+            for _ in range(gap):
+                a, b = b, a + b
+        current = i
+        values.append(a)
+    return values
+
+
+def fibonacci_many(indexes, workers=None):
+    """
+    Calculate F(i) for many indexes in parallel across processes.
+    
+    The distinct indexes are sorted and split into contiguous runs; each
+    run is computed in a ProcessPoolExecutor worker by _fibonacci_run.
+    
+    Args:
+        indexes (iterable): Positions in Fibonacci sequence (0-indexed)
+        workers (int): Number of worker processes (default: CPU count).
+            1 computes everything in the calling process.
+        
+    Returns:
+        list: F(i) for every index, in input order
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    indexes = list(indexes)
+    if any(i < 0 for i in indexes):
+        raise ValueError("Indexes must be non-negative integers")
+    unique = sorted(set(indexes))
+    if not unique:
+        return []
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Several runs per worker so the pool can balance uneven run costs
+    n_runs = min(len(unique), workers * RUNS_PER_WORKER)
+    run_size = -(-len(unique) // n_runs)
+    runs = [unique[i:i + run_size] for i in range(0, len(unique), run_size)]
+    
+    if workers == 1 or len(runs) == 1:
+        run_values = map(_fibonacci_run, runs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            run_values = list(executor.map(_fibonacci_run, runs))
+    
+    lookup = {}
+    for run, values in zip(runs, run_values):
+        lookup.update(zip(run, values))
+    return [lookup[i] for i in indexes]
+
+
+def _fibonacci_pair_mod(n, m):
+    """Fast doubling for (F(n) mod m, F(n+1) mod m); values stay below m."""
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == '1':
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def _factorize(n):
+    """Trial-division factorization as a {prime: exponent} dict."""
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def _pisano_prime(p):
+    """Pisano period of a prime p."""
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+    # pi(p) divides p - 1 when p = +-1 (mod 5), and 2(p + 1) otherwise
+    period = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+    for q in _factorize(period):
+        while period % q == 0 and _fibonacci_pair_mod(period // q, p) == (0, 1):
+            period //= q
+    return period
+
+
+@functools.lru_cache(maxsize=PISANO_CACHE_SIZE)
+def pisano_period(m):
+    """
+    Calculate the Pisano period of m, the period of F(n) mod m.
+    
+    Uses pi(p^k) = p^(k-1) * pi(p) and pi(a*b) = lcm(pi(a), pi(b)) for
+    coprime a, b. Results are cached per modulus.
+    
+    Args:
+        m (int): Modulus (m >= 1)
+        
+    Returns:
+        int: The Pisano period of m
+        
+    Time Complexity: O(sqrt(m)) for the factorization, O(1) when cached
+    """
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer")
+    if m == 1:
+        return 1
+    period = 1
+    for p, k in _factorize(m).items():
+        prime_power_period = _pisano_prime(p) * p ** (k - 1)
+        period = period * prime_power_period // math.gcd(period, prime_power_period)
+    return period
+
+
+def fibonacci_mod(n, m):
+    """
+    Calculate F(n) mod m without building the full big integer.
+    
+    n is first reduced by the cached Pisano period of m (for m up to
+    PISANO_MAX_MODULUS), then fast doubling is done in modular arithmetic.
+    
+    Args:
+        n (int): Position in Fibonacci sequence (0-indexed)
+        m (int): Modulus (m >= 1)
+        
+    Returns:
+        int: F(n) mod m
+        
+    Time Complexity: O(log n) operations on numbers below m
+    Space Complexity: O(1)
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer")
+    if m <= PISANO_MAX_MODULUS:
+        n %= pisano_period(m)
+    return _fibonacci_pair_mod(n, m)[0]
+
+
+def fibonacci_mod_many(ns, ms):
+    """
+    Calculate F(n) mod m for many (n, m) pairs in one call.
+    
+    With NumPy and moduli below 2**31, fast doubling runs once over whole
+    arrays (one pass per bit of the largest reduced n). Otherwise each pair
+    goes through fibonacci_mod.
+    
+    Args:
+        ns (iterable or numpy.ndarray): Positions (0-indexed)
+        ms (int, iterable or numpy.ndarray): One modulus per position, or
+            a single modulus shared by all of them
+        
+    Returns:
+        numpy.ndarray or list: F(n) mod m per pair, in input order
+            (a list when the NumPy path is not used)
+    """
+    if not hasattr(ns, '__len__'):
+        ns = list(ns)
+    if isinstance(ms, int):
+        ms = [ms] * len(ns)
+    elif not hasattr(ms, '__len__'):
+        ms = list(ms)
+    if len(ns) != len(ms):
+        raise ValueError("ns and ms must have the same length")
+    
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    
+    if np is None or len(ns) == 0 or int(max(ms)) >= 2 ** 31:
+        return [fibonacci_mod(int(n), int(m)) for n, m in zip(ns, ms)]
+    
+    m_arr = np.asarray(ms, dtype=np.int64)
+    if (m_arr < 1).any():
+        raise ValueError("Modulus must be a positive integer")
+    moduli, inverse = np.unique(m_arr, return_inverse=True)
+    periods = np.array([pisano_period(int(m)) for m in moduli],
+                       dtype=np.int64)[inverse.reshape(-1)]
+    
+    if isinstance(ns, np.ndarray) and ns.dtype.kind in 'iu':
+        if ns.dtype.kind == 'u':
+            # Reduce in uint64 first; indexes >= 2**63 would wrap in int64
+            n_arr = (ns.astype(np.uint64) % periods.astype(np.uint64)).astype(np.int64)
+        elif (ns < 0).any():
+            raise ValueError("n must be a non-negative integer")
+        else:
+            n_arr = ns.astype(np.int64) % periods
+    else:
+        if any(n < 0 for n in ns):
+            raise ValueError("n must be a non-negative integer")
+        n_arr = np.array([int(n) % p for n, p in zip(ns, periods.tolist())],
+                         dtype=np.int64)
+    
+    # Leading zero bits leave (0, 1) unchanged, so all pairs share one loop
+    a = np.zeros(len(n_arr), dtype=np.int64)
+    b = 1 % m_arr
+    for shift in range(int(n_arr.max()).bit_length() - 1, -1, -1):
+        c = a * ((2 * b - a) % m_arr) % m_arr
+        d = (a * a + b * b) % m_arr
+        bit = ((n_arr >> shift) & 1).astype(bool)
+        a, b = np.where(bit, d, c), np.where(bit, (c + d) % m_arr, d)
+    return a
+
+
+def _is_perfect_square(n):
+    """Exact perfect-square test that is safe for arbitrarily large ints."""
+    if n < 0:
+        return False
+    root = math.isqrt(n)
+    return root * root == n
 
 
 def is_fibonacci_number(num):
     """
     Check if a given number is a Fibonacci number.
     
-    A positive integer is a Fibonacci number if and only if one of
-    (5*n^2 + 4) or (5*n^2 - 4) is a perfect square.
+    A non-negative integer is a Fibonacci number if and only if one of
+    (5*n^2 + 4) or (5*n^2 - 4) is a perfect square. The test uses
+    math.isqrt, so it stays exact for big integers.
     
     Args:
         num (int): Number to check
@@ -141,18 +643,583 @@ def is_fibonacci_number(num):
     Returns:
         bool: True if num is a Fibonacci number, False otherwise
     """
-    import math
+    if num < 0:
+        return False
+    square = 5 * num * num
+    return _is_perfect_square(square + 4) or _is_perfect_square(square - 4)
+
+
+def _fibonacci_word_arrays(np):
+    """Build (and cache) the sorted int64 and uint64 lookup tables."""
+    global _FIB_WORD_ARRAYS
+    if _FIB_WORD_ARRAYS is None:
+        _FIB_WORD_ARRAYS = (
+            np.array(FIB_WORD_TABLE[:93], dtype=np.int64),
+            np.array(FIB_WORD_TABLE, dtype=np.uint64),
+        )
+    return _FIB_WORD_ARRAYS
+
+
+def _table_lookup(np, table, values):
+    """Vectorized membership test of values against a sorted table."""
+    idx = np.searchsorted(table, values)
+    np.minimum(idx, len(table) - 1, out=idx)
+    return table[idx] == values
+
+
+def _integral(num):
+    """num as an int, or None if it has a fractional part or is not finite."""
+    try:
+        integer = int(num)
+    except (OverflowError, ValueError):
+        return None
+    return integer if integer == num else None
+
+
+def is_fibonacci_batch(values):
+    """
+    Check many candidates for being Fibonacci numbers in one call.
+    
+    When NumPy is available, values that fit in a machine word are matched
+    against a precomputed sorted table of F(0)..F(93) with searchsorted;
+    only big-int leftovers go through the exact is_fibonacci_number test.
+    Without NumPy the same table is used as a set. Non-integral values
+    such as 5.5 are reported as False rather than truncated.
+    
+    Args:
+        values (iterable or numpy.ndarray): Numbers to check
+        
+    Returns:
+        numpy.ndarray or list: Boolean result per value, in input order
+            (a list only when NumPy is not installed)
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        integers = map(_integral, values)
+        return [
+            False if num is None
+            else num in _FIB_WORD_SET if 0 <= num <= FIB_WORD_TABLE[-1]
+            else is_fibonacci_number(num)
+            for num in integers
+        ]
+    
+    signed_table, unsigned_table = _fibonacci_word_arrays(np)
+    
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+        if values.dtype.kind == 'u':
+            return _table_lookup(np, unsigned_table, values.astype(np.uint64))
+        return _table_lookup(np, signed_table, values.astype(np.int64))
+    
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    result = np.zeros(len(values), dtype=bool)
+    
+    # Split into machine-word values and big-int leftovers
+    small_idx = []
+    small_values = []
+    for i, num in enumerate(values):
+        num = _integral(num)
+        if num is None:
+            continue
+        if _INT64_MIN <= num <= _INT64_MAX:
+            small_idx.append(i)
+            small_values.append(num)
+        else:
+            result[i] = is_fibonacci_number(num)
+    
+    if small_values:
+        small = np.array(small_values, dtype=np.int64)
+        result[small_idx] = _table_lookup(np, signed_table, small)
+    return result
+
+
+def _zeckendorf_table(n):
+    """Return the shared F(2), F(3), ... table, extended past n if needed."""
+    table = _ZECKENDORF_TABLE
+    while table[-1] <= n:
+        table.append(table[-1] + table[-2])
+    return table
+
+
+def _zeckendorf_terms(n):
+    """Table indexes j (term F(j+2)) of the Zeckendorf terms of n, descending."""
+    table = _zeckendorf_table(n)
+    hi = bisect.bisect_right(table, n)
+    terms = []
+    while n:
+        j = bisect.bisect_right(table, n, 0, hi) - 1
+        terms.append(j)
+        n -= table[j]
+        hi = j
+    return terms
+
+
+def zeckendorf(n):
+    """
+    Decompose n into a sum of non-consecutive Fibonacci numbers.
+    
+    Every non-negative integer has exactly one such decomposition
+    (Zeckendorf's theorem). Terms are found greedily by binary search in a
+    precomputed Fibonacci table.
+    
+    Args:
+        n (int): Number to decompose (n >= 0)
+        
+    Returns:
+        list: Fibonacci numbers summing to n, largest first
+        
+    Time Complexity: O(log^2 n)
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    table = _zeckendorf_table(n)
+    return [table[j] for j in _zeckendorf_terms(n)]
+
+
+@functools.lru_cache(maxsize=CODEWORD_CACHE_SIZE)
+def _codeword(n):
+    """Fibonacci codeword of n as (bits, length), first bit in bit 0."""
+    if n < 1:
+        raise ValueError("Fibonacci coding needs positive integers")
+    terms = _zeckendorf_terms(n)
+    code = 1 << (terms[0] + 1)
+    for j in terms:
+        code |= 1 << j
+    return code, terms[0] + 2
+
+
+def _encode_python(values):
+    out = bytearray()
+    acc = 0
+    nbits = 0
+    for n in values:
+        code, length = _codeword(int(n))
+        acc |= code << nbits
+        nbits += length
+        if nbits >= 64:
+            nbytes = nbits >> 3
+            out += (acc & ((1 << (nbytes * 8)) - 1)).to_bytes(nbytes, 'little')
+            acc >>= nbytes * 8
+            nbits -= nbytes * 8
+    if nbits:
+        out += acc.to_bytes((nbits + 7) // 8, 'little')
+    return bytes(out)
+
+
+def _encode_numpy(np, values):
+    table = np.array(_zeckendorf_table(0)[:92], dtype=np.uint64)
+    chunks = []
+    for begin in range(0, len(values), CODEC_CHUNK_SIZE):
+        remainder = values[begin:begin + CODEC_CHUNK_SIZE].copy()
+        rows = np.arange(len(remainder))
+        width = int(np.searchsorted(table, remainder.max(), side='right'))
+        bits = np.zeros((len(remainder), width + 1), dtype=np.uint8)
+        top = np.full(len(remainder), -1, dtype=np.int64)
+        # Greedy from the largest term down yields the Zeckendorf form
+        for j in range(width - 1, -1, -1):
+            take = remainder >= table[j]
+            bits[:, j] = take
+            remainder = np.where(take, remainder - table[j], remainder)
+            top = np.where(take & (top < 0), j, top)
+        bits[rows, top + 1] = 1
+        # Row-major boolean indexing concatenates the variable-length rows
+        chunks.append(bits[np.arange(width + 1) <= (top + 1)[:, None]])
+    return np.packbits(np.concatenate(chunks), bitorder='little').tobytes()
+
+
+def fibonacci_encode(values):
+    """
+    Encode positive integers as a bit-packed Fibonacci code.
+    
+    Each value is written as its Zeckendorf bits (F(2) first) followed by
+    an extra 1, so every codeword ends in "11" and the stream is
+    self-synchronizing. Bits are packed least-significant first. Integer
+    arrays below 2**64 are encoded column-wise with NumPy; other input
+    goes through cached per-value codewords and a 64-bit accumulator.
+    
+    Args:
+        values (iterable or numpy.ndarray): Integers >= 1
+        
+    Returns:
+        bytes: The packed code, zero-padded to a whole byte
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _encode_python(values)
+    
+    if not (isinstance(values, np.ndarray) and values.dtype.kind in 'iu'):
+        values = list(values)
+        if not values or max(values) >= 2 ** 64:
+            return _encode_python(values)
+    if len(values) == 0:
+        return b''
+    smallest = values.min() if isinstance(values, np.ndarray) else min(values)
+    if smallest < 1:
+        raise ValueError("Fibonacci coding needs positive integers")
+    return _encode_numpy(np, np.asarray(values, dtype=np.uint64))
+
+
+def _decode_python(buffer, count):
+    number = int.from_bytes(buffer, 'little')
+    if not number:
+        return []
+    # LSB-first bit string, so str.find scans for terminators in C
+    bits = format(number, 'b')[::-1]
+    values = []
+    pos = 0
+    while count is None or len(values) < count:
+        end = bits.find('11', pos)
+        if end < 0:
+            break
+        table = _ZECKENDORF_TABLE
+        while len(table) <= end - pos:
+            table.append(table[-1] + table[-2])
+        value = 0
+        j = bits.find('1', pos)
+        while 0 <= j <= end:
+            value += table[j - pos]
+            j = bits.find('1', j + 1)
+        values.append(value)
+        pos = end + 2
+    return values
+
+
+def _decode_numpy(np, buffer, count):
+    bits = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8), bitorder='little')
+    
+    # Data 1s never touch inside a codeword, so a run of r ones starting at
+    # s ends codewords at s+1, s+3, ... (r // 2 terminators); an odd
+    # leftover 1 is the first data bit of the following codeword.
+    edges = np.diff(np.concatenate(([0], bits, [0])).astype(np.int8))
+    run_starts = np.flatnonzero(edges == 1)
+    pairs = (np.flatnonzero(edges == -1) - run_starts) // 2
+    total = int(pairs.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+    terminators = np.repeat(run_starts + 1, pairs) + 2 * offsets
+    if count is not None:
+        terminators = terminators[:count]
+    if len(terminators) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    code_starts = np.concatenate(([0], terminators[:-1] + 1))
+    
+    is_terminator = np.zeros(len(bits), dtype=bool)
+    is_terminator[terminators] = True
+    ones = np.flatnonzero(bits[:terminators[-1]])
+    data = ones[~is_terminator[ones]]
+    codeword = np.searchsorted(terminators, data)
+    position = data - code_starts[codeword]
+    if position.max() >= 91:
+        return None
+    
+    # Every codeword has a data bit just before its terminator, so each
+    # codeword owns a non-empty, contiguous slice of weights
+    table = np.array(_zeckendorf_table(0)[:91], dtype=np.uint64)
+    firsts = np.flatnonzero(np.diff(codeword, prepend=-1))
+    return np.add.reduceat(table[position], firsts)
+
+
+def fibonacci_decode(buffer, count=None):
+    """
+    Decode a bit-packed Fibonacci code produced by fibonacci_encode.
+    
+    With NumPy, codeword boundaries are located with vectorized run-length
+    arithmetic and values are summed with np.add.reduceat. Codewords longer
+    than 91 bits (values of F(93) and up) fall back to the exact decoder.
+    
+    Args:
+        buffer (bytes, bytearray or memoryview): Packed code
+        count (int): Maximum number of values to decode (default: all)
+        
+    Returns:
+        numpy.ndarray or list: Decoded values in order (uint64 array on
+            the NumPy path, list of ints otherwise)
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _decode_python(buffer, count)
+    values = _decode_numpy(np, buffer, count)
+    if values is None:
+        return _decode_python(buffer, count)
+    return values
+
+
+def _encode_text(num):
+    return str(num).encode('ascii') + b'\n'
+
+
+def _encode_binary(num):
+    payload = num.to_bytes((num.bit_length() + 7) // 8 or 1, 'little')
+    return _LENGTH_PREFIX.pack(len(payload)) + payload
+
+
+def _save_checkpoint(path, state):
+    """Atomically replace the checkpoint file with state."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def fibonacci_export(path, start, stop, fmt='text', chunk_size=10000,
+                     checkpoint=None, resume=False, report=print):
+    """
+    Stream F(start)..F(stop) to a file in fixed-size chunks.
+    
+    Only the two running values are kept in memory. After every chunk the
+    data is flushed and, if a checkpoint path is given, the next index, its
+    two seed values and the file offset are saved so an interrupted export
+    can be resumed with resume=True.
+    
+    Args:
+        path (str): Output file
+        start (int): First index to write (inclusive)
+        stop (int): Last index to write (inclusive)
+        fmt (str): 'text' for one decimal number per line, or 'binary'
+            for little-endian ints prefixed with a 4-byte length
+        chunk_size (int): Numbers per write
+        checkpoint (str): Checkpoint file path, or None to disable
+        resume (bool): Continue from checkpoint if it exists
+        report (callable): Called with a progress line after every chunk,
+            or None to stay quiet
+        
+    Returns:
+        dict: numbers, bytes, seconds, numbers_per_sec and bytes_per_sec
+            for this invocation
+        
+    Time Complexity: O(stop - start) big-integer additions
+    Space Complexity: O(1) values in memory
+    """
+    if fmt == 'text':
+        encode = _encode_text
+    elif fmt == 'binary':
+        encode = _encode_binary
+    else:
+        raise ValueError("fmt must be 'text' or 'binary'")
+    if start < 0 or stop < start:
+        raise ValueError("Need 0 <= start <= stop")
+    
+    state = None
+    if resume and checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if (state['format'], state.get('start'), state['stop']) != (fmt, start, stop):
+            raise ValueError("Checkpoint does not match this export")
+        # Resuming needs every byte up to the checkpointed offset
+        if not os.path.exists(path) or os.path.getsize(path) < state['offset']:
+            raise FileNotFoundError(
+                f"Cannot resume: {path} is missing or shorter than checkpoint {checkpoint} "
+                "records; delete the checkpoint to start over")
+    
+    if state is None:
+        index = start
+        a, b = fibonacci_pair(start)
+        offset = 0
+        mode = 'wb'
+    else:
+        index = state['next_index']
+        a, b = int(state['a'], 16), int(state['b'], 16)
+        offset = state['offset']
+        mode = 'r+b'
     
-    def is_perfect_square(n):
-        if n < 0:
-            return False
-        root = int(math.sqrt(n))
-        return root * root == n
+    # Decimal conversion of very large ints is capped by default
+    old_limit = None
+    if fmt == 'text' and hasattr(sys, 'set_int_max_str_digits'):
+        old_limit = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
     
-    return is_perfect_square(5 * num * num + 4) or is_perfect_square(5 * num * num - 4)
+    written_numbers = 0
+    written_bytes = 0
+    start_time = time.perf_counter()
+    try:
+        with open(path, mode) as out:
+            # Drop anything written after the last checkpoint
+            out.seek(offset)
+            out.truncate()
+            while index <= stop:
+                chunk_end = min(index + chunk_size, stop + 1)
+                chunk = []
+                for _ in range(index, chunk_end):
+                    chunk.append(encode(a))
+                    a, b = b, a + b
+                data = b''.join(chunk)
+                out.write(data)
+                out.flush()
+                
+                written_numbers += chunk_end - index
+                written_bytes += len(data)
+                offset += len(data)
+                index = chunk_end
+                
+                if checkpoint:
+                    os.fsync(out.fileno())
+                    _save_checkpoint(checkpoint, {
+                        'next_index': index,
+                        'a': hex(a),
+                        'b': hex(b),
+                        'offset': offset,
+                        'start': start,
+                        'stop': stop,
+                        'format': fmt,
+                    })
+                
+                if report is not None:
+                    elapsed = max(time.perf_counter() - start_time, 1e-9)
+                    report(f"  F({index - 1}) written: "
+                           f"{written_numbers / elapsed:,.0f} numbers/s, "
+                           f"{written_bytes / elapsed / 1e6:,.2f} MB/s")
+    finally:
+        if old_limit is not None:
+            sys.set_int_max_str_digits(old_limit)
+    
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    return {
+        'numbers': written_numbers,
+        'bytes': written_bytes,
+        'seconds': elapsed,
+        'numbers_per_sec': written_numbers / elapsed,
+        'bytes_per_sec': written_bytes / elapsed,
+    }
+
+
+def read_fibonacci_export(path):
+    """
+    Read back numbers written by fibonacci_export with fmt='binary'.
+    
+    Args:
+        path (str): File written in binary format
+        
+    Yields:
+        int: Next number in the file
+    """
+    prefix_size = _LENGTH_PREFIX.size
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(prefix_size)
+            if len(header) < prefix_size:
+                return
+            (length,) = _LENGTH_PREFIX.unpack(header)
+            yield int.from_bytes(f.read(length), 'little')
 
 
-def main():
+def fibonacci_digit_count(n):
+    """
+    Count the decimal digits of F(n) without converting it to a string.
+    
+    Uses F(n) = round(phi^n / sqrt(5)), so the digit count is
+    floor(n*log10(phi) - log10(sqrt(5))) + 1. That value is computed in
+    floats up to DIGIT_COUNT_FLOAT_MAX and in Decimal, with precision
+    growing with the digits of n, beyond it. Only when it lands too close
+    to an integer boundary for that precision is F(n) computed and
+    compared against a power of ten.
+    
+    Args:
+        n (int): Position in Fibonacci sequence (0-indexed)
+        
+    Returns:
+        int: Number of decimal digits in F(n)
+        
+    Time Complexity: O(1) except near digit boundaries
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if n < FAST_DOUBLING_THRESHOLD:
+        return len(str(fibonacci_nth(n)))
+    if n <= DIGIT_COUNT_FLOAT_MAX:
+        estimate = n * _LOG10_PHI - _LOG10_SQRT5
+        tolerance = 1e-6
+    else:
+        with decimal.localcontext() as context:
+            context.prec = len(str(n)) + DIGIT_COUNT_GUARD_DIGITS
+            sqrt5 = decimal.Decimal(5).sqrt()
+            estimate = n * ((1 + sqrt5) / 2).log10() - sqrt5.log10()
+        tolerance = decimal.Decimal(10) ** -(DIGIT_COUNT_GUARD_DIGITS // 2)
+    digits = math.floor(estimate) + 1
+    if abs(estimate - round(estimate)) > tolerance:
+        return digits
+    value = fibonacci_nth(n)
+    if value < 10 ** (digits - 1):
+        return digits - 1
+    if value >= 10 ** digits:
+        return digits + 1
+    return digits
+
+
+def _parse_index_spec(spec):
+    """Parse 'n' or an inclusive range 'a-b' into (start, stop)."""
+    start, sep, stop = spec.strip().partition('-')
+    start = int(start)
+    stop = int(stop) if sep else start
+    if start < 0 or stop < start:
+        raise ValueError(f"Invalid index or range: {spec!r}")
+    return start, stop
+
+
+def _iter_range(start, stop, method):
+    """Yield (i, F(i)) for a range, walking forward when method allows."""
+    if method != 'auto':
+        for i in range(start, stop + 1):
+            yield i, fibonacci_nth(i, method)
+        return
+    a, b = fibonacci_pair(start)
+    for i in range(start, stop + 1):
+        yield i, a
+        a, b = b, a + b
+
+
+def run_batch(specs, method='auto', count_digits=False, last_k_digits=None,
+              out=None):
+    """
+    Write F(n) for every index or range spec as 'n<TAB>result' lines.
+    
+    Output goes through a buffered binary writer line by line, so no list
+    or combined string is built. With count_digits or last_k_digits the
+    full decimal conversion of F(n), the dominant cost for large n, is
+    skipped entirely.
+    
+    Args:
+        specs (iterable): Index specs such as '10' or '100-200'
+        method (str): Method passed to fibonacci_nth
+        count_digits (bool): Write the digit count instead of the value
+        last_k_digits (int): Write only the last k digits of the value
+        out (binary file): Destination (default: sys.stdout.buffer)
+    """
+    if out is None:
+        out = sys.stdout.buffer
+    writer = io.BufferedWriter(out, buffer_size=CLI_BUFFER_SIZE) if isinstance(
+        out, io.RawIOBase) else out
+    
+    old_limit = None
+    if hasattr(sys, 'set_int_max_str_digits'):
+        old_limit = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
+    try:
+        for spec in specs:
+            start, stop = _parse_index_spec(spec)
+            if count_digits:
+                results = ((i, fibonacci_digit_count(i)) for i in range(start, stop + 1))
+            elif last_k_digits is not None:
+                modulus = 10 ** last_k_digits
+                results = (
+                    (i, str(fibonacci_mod(i, modulus)).zfill(
+                        min(last_k_digits, fibonacci_digit_count(i))))
+                    for i in range(start, stop + 1)
+                )
+            else:
+                results = _iter_range(start, stop, method)
+            for i, result in results:
+                writer.write(f"{i}\t{result}\n".encode('ascii'))
+        writer.flush()
+    finally:
+        if old_limit is not None:
+            sys.set_int_max_str_digits(old_limit)
+
+
+def demo():
     """
     Demonstrate different Fibonacci implementations.
     """
@@ -168,6 +1235,9 @@ def main():
     except ValueError:
         print("Please enter a valid integer.")
         return
+    except EOFError:
+        print("\nNo input given.")
+        return
     
     print(f"\nGenerating first {n} Fibonacci numbers:\n")
     
@@ -196,5 +1266,74 @@ def main():
         print(f"   {num} is {'a' if is_fib else 'not a'} Fibonacci number")
 
 
+def _stdin_has_data():
+    """
+    True if stdin is piped or redirected and not empty. Waits for the
+    first byte (or end of input), so an empty or closed stdin, as under
+    IDE runners and CI, still reaches the demo.
+    """
+    if sys.stdin is None or sys.stdin.isatty():
+        return False
+    try:
+        return bool(sys.stdin.buffer.peek(1))
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+    
+    With index arguments, or indexes piped on stdin, runs non-interactive
+    batch mode via run_batch. With neither, runs the interactive demo.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compute Fibonacci numbers. Without arguments or piped "
+                    "input, runs the interactive demo.")
+    parser.add_argument('indexes', nargs='*',
+                        help="Indexes or inclusive ranges like 100-200; "
+                             "'-' reads more from stdin")
+    parser.add_argument('--method', default='auto',
+                        choices=['auto', 'iterative', 'recursive', 'memoized',
+                                 'fast_doubling'])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--count-digits', action='store_true',
+                      help="Print the number of decimal digits of F(n)")
+    mode.add_argument('--last-k-digits', type=_positive_int, metavar='K',
+                      help="Print only the last K decimal digits of F(n)")
+    args = parser.parse_args(argv)
+    
+    specs = args.indexes
+    if not specs and _stdin_has_data():
+        specs = ['-']
+    if not specs:
+        demo()
+        return 0
+    
+    def expand(specs):
+        for spec in specs:
+            if spec == '-':
+                for line in sys.stdin:
+                    yield from line.split()
+            else:
+                yield spec
+    
+    try:
+        run_batch(expand(specs), method=args.method,
+                  count_digits=args.count_digits,
+                  last_k_digits=args.last_k_digits)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
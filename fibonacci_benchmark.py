@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Fibonacci Benchmark Suite
+
+Times every implementation in fibonacci.py across a sweep of n using
+time.perf_counter_ns, with warmup calls, repeated trials and median/p95
+reporting. Peak memory of one extra call is measured separately with
+tracemalloc so tracing does not distort the timings. Results are written
+as JSON or CSV and can be compared against an earlier run; the shared
+helpers live in benchmark_utils.py.
+
+Usage:
+    python fibonacci_benchmark.py --sizes 10 100 1000 10000 --output bench.json
+    python fibonacci_benchmark.py --compare bench.json --output new.json
+"""
+
+import argparse
+import math
+import random
+import statistics
+import sys
+from collections import deque
+
+import fibonacci
+from benchmark_utils import (REGRESSION_RATIO, compare_results, load_results, peak_memory,
+                             percentile, time_call, write_results)
+
+# --- Configuration ---
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_WARMUP = 3
+DEFAULT_REPEATS = 25
+
+# Values per codec benchmark run, drawn log-uniformly below this bound
+DEFAULT_CODEC_COUNT = 100000
+CODEC_MAX_VALUE = 2 ** 40
+
+
+def _consume(iterator):
+    deque(iterator, maxlen=0)
+
+
+def _memoized_cold(n):
+    # A fresh memo per call, so every trial measures the fill, not a hit
+    return lambda: fibonacci.fibonacci_memoized(n, fibonacci.FibonacciMemo())
+
+
+def _memoized_warm(n):
+    memo = fibonacci.FibonacciMemo()
+    memo.get(n)
+    return lambda: fibonacci.fibonacci_memoized(n, memo)
+
+
+def _is_fibonacci(n):
+    value = fibonacci.fibonacci_nth(n)
+    return lambda: fibonacci.is_fibonacci_number(value)
+
+
+def _many(workers):
+    # n indexes spread up to 10n, so runs are walked as well as jumped
+    return lambda n: lambda: fibonacci.fibonacci_many(range(0, 10 * n, 10), workers)
+
+
+def _is_fibonacci_batch(n):
+    # n candidates below 2**63, every other one a Fibonacci number
+    rng = random.Random(n)
+    values = [fibonacci.fibonacci_nth(rng.randrange(93)) if i % 2 else rng.randrange(2 ** 63)
+              for i in range(n)]
+    return lambda: fibonacci.is_fibonacci_batch(values)
+
+
+# Each entry maps a method name to (factory, largest n worth running).
+# The factory does any setup for n and returns the zero-argument call to
+# time, so setup cost stays out of the measurement.
+BENCHMARKS = {
+    'iterative': (lambda n: lambda: fibonacci.fibonacci_iterative(n), 20000),
+    'recursive': (lambda n: lambda: fibonacci.fibonacci_recursive(n), 20),
+    'memoized_cold': (_memoized_cold, None),
+    'memoized_warm': (_memoized_warm, None),
+    'generator': (lambda n: lambda: _consume(fibonacci.fibonacci_generator(n)), None),
+    'nth_iterative': (lambda n: lambda: fibonacci.fibonacci_nth(n, 'iterative'), None),
+    'nth_fast_doubling': (lambda n: lambda: fibonacci.fibonacci_nth(n, 'fast_doubling'), None),
+    'nth_auto': (lambda n: lambda: fibonacci.fibonacci_nth(n), None),
+    'is_fibonacci_number': (_is_fibonacci, None),
+    'fibonacci_mod': (lambda n: lambda: fibonacci.fibonacci_mod(n, 10 ** 9 + 7), None),
+    'many_serial': (_many(1), None),
+    'many_parallel': (_many(None), None),
+    'is_fibonacci_batch': (_is_fibonacci_batch, None),
+}
+
+# --- Main Script ---
+
+def run_benchmarks(sizes, methods, warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS):
+    """Benchmarks every method for every size and returns one row per pair."""
+    rows = []
+    for method in methods:
+        factory, max_n = BENCHMARKS[method]
+        for n in sizes:
+            if max_n is not None and n > max_n:
+                continue
+            func = factory(n)
+            samples = time_call(func, warmup, repeats)
+            row = {
+                'method': method,
+                'n': n,
+                'repeats': repeats,
+                'median_ns': statistics.median(samples),
+                'p95_ns': percentile(samples, 95),
+                'min_ns': min(samples),
+                'mean_ns': statistics.fmean(samples),
+                'peak_bytes': peak_memory(func),
+            }
+            rows.append(row)
+            print(f"  {method:<20} n={n:<8} median {row['median_ns'] / 1e3:>12.1f} us"
+                  f"  p95 {row['p95_ns'] / 1e3:>12.1f} us"
+                  f"  peak {row['peak_bytes'] / 1024:>10.1f} KiB")
+    return rows
+
+
+def naive_fibonacci_encode(values):
+    """Reference encoder: one Python string per bit, packed at the end."""
+    table = fibonacci.fibonacci_iterative(95)[2:]
+    bits = []
+    for n in values:
+        codeword = []
+        for fib in reversed(table):
+            if fib <= n:
+                codeword.append('1')
+                n -= fib
+            elif codeword:
+                codeword.append('0')
+        codeword.reverse()
+        bits.extend(codeword)
+        bits.append('1')
+    bits.extend('0' * (-len(bits) % 8))
+    return bytes(int(''.join(reversed(bits[i:i + 8])), 2) for i in range(0, len(bits), 8))
+
+
+def naive_fibonacci_decode(buffer):
+    """Reference decoder: walks the stream one bit at a time."""
+    table = fibonacci.fibonacci_iterative(95)[2:]
+    values = []
+    value = position = previous = 0
+    for byte in buffer:
+        for shift in range(8):
+            bit = (byte >> shift) & 1
+            if bit and previous:
+                values.append(value)
+                value = position = previous = 0
+                continue
+            if bit:
+                value += table[position]
+            position += 1
+            previous = bit
+    return values
+
+
+def benchmark_codec(count=DEFAULT_CODEC_COUNT, warmup=1, repeats=5):
+    """Compares Fibonacci-code throughput (MB/s of encoded data) with the naive loop."""
+    rng = random.Random(42)
+    values = [int(2 ** rng.uniform(0, math.log2(CODEC_MAX_VALUE))) or 1 for _ in range(count)]
+    encoded = fibonacci.fibonacci_encode(values)
+    size_mb = len(encoded) / 1e6
+
+    cases = {
+        'codec_encode': lambda: fibonacci.fibonacci_encode(values),
+        'codec_decode': lambda: fibonacci.fibonacci_decode(encoded),
+        'naive_encode': lambda: naive_fibonacci_encode(values),
+        'naive_decode': lambda: naive_fibonacci_decode(encoded),
+    }
+    rows = []
+    for method, func in cases.items():
+        samples = time_call(func, warmup, repeats)
+        median = statistics.median(samples)
+        row = {
+            'method': method,
+            'n': count,
+            'repeats': repeats,
+            'median_ns': median,
+            'p95_ns': percentile(samples, 95),
+            'min_ns': min(samples),
+            'mean_ns': statistics.fmean(samples),
+            'peak_bytes': peak_memory(func),
+            'mb_per_s': size_mb / (median / 1e9),
+        }
+        rows.append(row)
+        print(f"  {method:<20} n={count:<8} median {median / 1e3:>12.1f} us"
+              f"  {row['mb_per_s']:>10.2f} MB/s")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Fibonacci implementations.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--methods', nargs='+', choices=list(BENCHMARKS),
+                        default=list(BENCHMARKS))
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--codec', type=int, nargs='?', const=DEFAULT_CODEC_COUNT,
+                        metavar='COUNT', help="Also benchmark the Fibonacci-code codec")
+    parser.add_argument('--output', default='fibonacci_benchmark.json',
+                        help="Result file (.json or .csv)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Earlier result file to check for regressions")
+    args = parser.parse_args(argv)
+
+    print("Running Fibonacci benchmarks...")
+    rows = run_benchmarks(args.sizes, args.methods, args.warmup, args.repeats)
+    if args.codec:
+        print("\nRunning Fibonacci-code codec benchmarks...")
+        rows += benchmark_codec(args.codec)
+    write_results(rows, args.output)
+    print(f"\nBenchmark results saved to {args.output}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), rows)
+        if regressions:
+            print(f"\n--- Regressions (> {REGRESSION_RATIO:.2f}x baseline median) ---")
+            for method, n, old, new in regressions:
+                print(f"  {method} n={n}: {old / 1e3:.1f} us -> {new / 1e3:.1f} us")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
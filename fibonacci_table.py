@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Precomputed Fibonacci Lookup Table
+
+Builds a binary table of F(0)..F(N) once, so services can look values up
+instead of recomputing them in every process. The table is memory-mapped
+read-only, so all worker processes share one page-cached copy.
+
+File layout (all integers little-endian):
+    header   magic b'FIBT', version (uint32), N (uint64), small count (uint64)
+    small    F(0)..F(92) as fixed-width uint64
+    offsets  (N - 92 + 1) uint64 offsets into the blob for F(93)..F(N)
+    blob     F(93)..F(N) as packed little-endian byte strings
+
+Usage:
+    python fibonacci_table.py build fib.table 100000
+    python fibonacci_table.py get fib.table 10 5000 250000
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from fibonacci import fibonacci_nth
+
+# --- Configuration ---
+
+MAGIC = b'FIBT'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQ')
+WORD = struct.Struct('<Q')
+
+# F(92) is the last Fibonacci number that fits in a signed 64-bit word
+SMALL_COUNT = 93
+
+# --- Main Script ---
+
+def build_table(path, last_index):
+    """
+    Write F(0)..F(last_index) to path in the table format.
+
+    Values are produced with the iterative recurrence and streamed to the
+    blob, so only the two running values and the offset index are held in
+    memory. The file is written to a temporary name and renamed at the end.
+
+    Args:
+        path (str): Output file
+        last_index (int): Largest index N to store (N >= 0)
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    if last_index < 0:
+        raise ValueError("last_index must be a non-negative integer")
+    small_count = min(SMALL_COUNT, last_index + 1)
+    big_count = last_index + 1 - small_count
+    offsets_start = HEADER.size + small_count * WORD.size
+    blob_start = offsets_start + (big_count + 1) * WORD.size
+
+    offsets = [0]
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, last_index, small_count))
+        a, b = 0, 1
+        for _ in range(small_count):
+            f.write(WORD.pack(a))
+            a, b = b, a + b
+
+        # Reserve the offset index, stream the blob, then fill the index in
+        f.seek(blob_start)
+        for _ in range(big_count):
+            payload = a.to_bytes((a.bit_length() + 7) // 8, 'little')
+            f.write(payload)
+            offsets.append(offsets[-1] + len(payload))
+            a, b = b, a + b
+        if big_count:
+            f.seek(offsets_start)
+            f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # Without big values the reserved index and blob are never written
+    return os.path.getsize(path)
+
+
+class FibonacciTable:
+    """
+    Read-only, memory-mapped view of a table written by build_table.
+
+    Lookups inside the table are O(1) and do no arithmetic; indexes past
+    the table fall back to fibonacci.fibonacci_nth.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        magic, version, last_index, small_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} Fibonacci table")
+        self.last_index = last_index
+        self._small_count = small_count
+        self._offsets_start = HEADER.size + small_count * WORD.size
+        big_count = last_index + 1 - small_count
+        self._blob_start = self._offsets_start + (big_count + 1) * WORD.size
+
+    def __len__(self):
+        return self.last_index + 1
+
+    def __contains__(self, i):
+        return 0 <= i <= self.last_index
+
+    def __getitem__(self, i):
+        return self.get(i)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, i):
+        """
+        Return F(i), from the table when i is stored.
+
+        Args:
+            i (int): Position in Fibonacci sequence (0-indexed)
+
+        Returns:
+            int: The ith Fibonacci number
+        """
+        if i < 0:
+            raise ValueError("Index must be a non-negative integer")
+        if i > self.last_index:
+            return fibonacci_nth(i)
+        if i < self._small_count:
+            return WORD.unpack_from(self._mm, HEADER.size + i * WORD.size)[0]
+        position = self._offsets_start + (i - self._small_count) * WORD.size
+        start, end = struct.unpack_from('<2Q', self._mm, position)
+        return int.from_bytes(self._mm[self._blob_start + start:self._blob_start + end], 'little')
+
+    def close(self):
+        """Unmap the table and close its file."""
+        self._mm.close()
+        self._file.close()
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) >= 3 and args[0] == 'build':
+        size = build_table(args[1], int(args[2]))
+        print(f"Table of F(0)..F({args[2]}) saved to {args[1]} ({size:,} bytes)")
+    elif len(args) >= 3 and args[0] == 'get':
+        with FibonacciTable(args[1]) as table:
+            for i in args[2:]:
+                print(f"F({i}) = {table[int(i)]}")
+    else:
+        print("Usage: fibonacci_table.py build PATH N | get PATH I [I ...]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Graph Generator Benchmark
+
+Times how long graph_generator takes to prepare chart data as the input
+grows: the columnar box_plot_frame against the original row-by-row
+iterrows loop on the simulated path (one summary row per series), and
+the real-samples path (one row per request). With --render, whole chart
+renders from a samples file are compared too: seaborn on the raw samples
+against the streaming pre-aggregated mode, with time and peak traced
+memory, plus the downsampled time series, small multiples and percentile
+charts. Timing uses benchmark_utils.time_call, and results are
+written as JSON or CSV.
+
+Startup is timed as well: importing graph_generator in a fresh
+interpreter, and importing it plus the plotting stack. The run fails if
+the bare import exceeds IMPORT_BUDGET_MS, or if --compare finds a
+median slower than the baseline's.
+
+Usage:
+    python graph_benchmark.py --sizes 1000 10000 100000 1000000 --output graphs.json
+    python graph_benchmark.py --render 100000 1000000
+    python graph_benchmark.py --compare graphs.json --output new.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import graph_generator
+from benchmark_utils import (REGRESSION_RATIO, compare_results, load_results, peak_memory,
+                             percentile, time_call, write_results)
+
+# --- Configuration ---
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+
+# Fresh interpreters started per import measurement, and the largest
+# median import time of graph_generator (without plotting) allowed
+IMPORT_REPEATS = 7
+IMPORT_BUDGET_MS = 150
+
+# Statements timed in a fresh interpreter by benchmark_import
+IMPORT_CASES = {
+    'import_graph_generator': 'import graph_generator',
+    'import_with_plotting': 'import graph_generator; graph_generator._plotting()',
+}
+
+# The row-by-row reference gets too slow to time past this many rows
+NAIVE_MAX_ROWS = 100000
+
+EXPLORERS = ['Blockonomics', 'Blockchain.com', 'BTC.com']
+SEARCH_TYPES = ['Transaction', 'Address', 'Block']
+
+# --- Main Script ---
+
+def synthetic_summary(rows, seed=0):
+    """Summary frame with rows series and lognormal average latencies."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Explorer': np.resize(EXPLORERS, rows),
+        'SearchType': np.resize(SEARCH_TYPES, rows),
+        'AverageLatency': rng.lognormal(np.log(200), 0.5, rows)
+    })
+
+
+def synthetic_samples(rows, seed=0):
+    """Samples frame with rows requests over an hour, about 1% of them failed."""
+    rng = np.random.default_rng(seed)
+    latency = rng.lognormal(np.log(200), 0.5, rows)
+    latency[rng.random(rows) < 0.01] = np.nan
+    return pd.DataFrame({
+        'Explorer': rng.choice(EXPLORERS, rows),
+        'SearchType': rng.choice(SEARCH_TYPES, rows),
+        'Timestamp': 1.7e9 + np.sort(rng.uniform(0, 3600, rows)),
+        'Latency': latency
+    })
+
+
+def naive_box_plot_frame(data_df, draws=graph_generator.SIMULATED_DRAWS):
+    """Reference: the original iterrows loop, one dict per simulated latency."""
+    box_plot_data = []
+    np.random.seed(42)
+    for _, row in data_df.iterrows():
+        simulated_latencies = np.random.normal(
+            loc=row['AverageLatency'],
+            scale=row['AverageLatency'] * graph_generator.SIMULATED_STDDEV,
+            size=draws
+        )
+        for latency in simulated_latencies:
+            box_plot_data.append({
+                'Explorer': row['Explorer'],
+                'SearchType': row['SearchType'],
+                'Latency': latency
+            })
+    return pd.DataFrame(box_plot_data)
+
+
+def benchmark_box_plot_frame(sizes, warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS):
+    """
+    Times box plot data preparation for every size, where size is the
+    number of rows in the resulting frame.
+    """
+    draws = graph_generator.SIMULATED_DRAWS
+    rows = []
+    for size in sizes:
+        summary = synthetic_summary(max(1, size // draws))
+        samples = synthetic_samples(size)
+        cases = {
+            'simulated_columnar': lambda: graph_generator.box_plot_frame(summary),
+            'samples_columnar': lambda: graph_generator.box_plot_frame(summary, samples),
+        }
+        if size <= NAIVE_MAX_ROWS:
+            cases['simulated_iterrows'] = lambda: naive_box_plot_frame(summary)
+        for method, func in cases.items():
+            samples_ns = time_call(func, warmup, repeats)
+            row = {
+                'method': method,
+                'n': size,
+                'repeats': repeats,
+                'median_ns': statistics.median(samples_ns),
+                'p95_ns': percentile(samples_ns, 95),
+                'min_ns': min(samples_ns),
+            }
+            rows.append(row)
+            print(f"  {method:<20} rows={size:<9} median {row['median_ns'] / 1e6:>10.2f} ms"
+                  f"  ({row['median_ns'] / size:.0f} ns/row)")
+    return rows
+
+
+def time_import(statement):
+    """Nanoseconds a fresh interpreter takes to run statement."""
+    code = ("import time; start = time.perf_counter_ns(); "
+            f"{statement}; print(time.perf_counter_ns() - start)")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_import(repeats=IMPORT_REPEATS):
+    """Times each IMPORT_CASES statement in repeats fresh interpreters."""
+    rows = []
+    for method, statement in IMPORT_CASES.items():
+        samples_ns = [time_import(statement) for _ in range(repeats)]
+        row = {
+            'method': method,
+            'n': 1,
+            'repeats': repeats,
+            'median_ns': statistics.median(samples_ns),
+            'p95_ns': percentile(samples_ns, 95),
+            'min_ns': min(samples_ns),
+        }
+        rows.append(row)
+        print(f"  {method:<24} median {row['median_ns'] / 1e6:>8.1f} ms"
+              f"  min {row['min_ns'] / 1e6:>8.1f} ms")
+    return rows
+
+
+def benchmark_render(sizes, repeats=1):
+    """
+    Times drawing the charts from a samples CSV of each size, from the raw
+    samples and in pre-aggregated mode (including the streaming pass), and
+    the sample-fed charts of sample_chart_jobs (including their binning).
+    """
+    summary = synthetic_summary(len(EXPLORERS) * len(SEARCH_TYPES))
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_generator.OUTPUT_BAR_CHART = os.path.join(tmp, 'bar.png')
+        graph_generator.OUTPUT_BOX_PLOT = os.path.join(tmp, 'box.png')
+        graph_generator.OUTPUT_TIMESERIES = os.path.join(tmp, 'timeseries.png')
+        graph_generator.OUTPUT_PERCENTILES = os.path.join(tmp, 'percentiles.png')
+        graph_generator.OUTPUT_SMALL_MULTIPLES = os.path.join(tmp, 'small_multiples.png')
+        for size in sizes:
+            path = os.path.join(tmp, f'samples-{size}.csv')
+            synthetic_samples(size).to_csv(path, index=False)
+
+            def raw():
+                samples = pd.read_csv(path, usecols=graph_generator.BOX_PLOT_COLUMNS)
+                graph_generator.generate_graphs(summary, samples, workers=1, cache_file=None)
+
+            def aggregated():
+                graph_generator.generate_summary_graphs(graph_generator.aggregate_samples(path),
+                                                        workers=1, cache_file=None)
+
+            def sample_charts():
+                samples = pd.read_csv(
+                    path, usecols=lambda column: column in graph_generator.SAMPLE_CHART_COLUMNS)
+                graph_generator.render_charts(graph_generator.sample_chart_jobs(samples),
+                                              workers=1, cache_file=None)
+
+            cases = (('render_raw', raw), ('render_aggregated', aggregated),
+                     ('render_sample_charts', sample_charts))
+            for method, func in cases:
+                samples_ns = time_call(func, 0, repeats)
+                row = {
+                    'method': method,
+                    'n': size,
+                    'repeats': repeats,
+                    'median_ns': statistics.median(samples_ns),
+                    'min_ns': min(samples_ns),
+                    'peak_bytes': peak_memory(func),
+                }
+                rows.append(row)
+                print(f"  {method:<20} rows={size:<9} median {row['median_ns'] / 1e9:>8.2f} s"
+                      f"  peak {row['peak_bytes'] / 2 ** 20:>8.1f} MiB")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark graph_generator chart preparation.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Rows in the box plot frame")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--render', type=int, nargs='*', metavar='ROWS',
+                        help="Also time whole chart renders for samples files of these sizes")
+    parser.add_argument('--output', default='graph_benchmark.json',
+                        help="Result file (.json or .csv)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Earlier result file to check for regressions")
+    args = parser.parse_args(argv)
+
+    print("Benchmarking startup...")
+    rows = benchmark_import()
+    status = 0
+    import_ms = rows[0]['median_ns'] / 1e6
+    if import_ms > IMPORT_BUDGET_MS:
+        print(f"  import graph_generator took {import_ms:.1f} ms, "
+              f"over the {IMPORT_BUDGET_MS} ms budget")
+        status = 1
+
+    print("\nBenchmarking box plot data preparation...")
+    rows += benchmark_box_plot_frame(args.sizes, args.warmup, args.repeats)
+    if args.render:
+        print("\nBenchmarking chart rendering from a samples file...")
+        rows += benchmark_render(args.render)
+    write_results(rows, args.output)
+    print(f"\nBenchmark results saved to {args.output}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), rows)
+        if regressions:
+            print(f"\n--- Regressions (> {REGRESSION_RATIO:.2f}x baseline median) ---")
+            for method, n, old, new in regressions:
+                print(f"  {method} n={n}: {old / 1e6:.2f} ms -> {new / 1e6:.2f} ms")
+            status = 1
+        else:
+            print("\nNo regressions against baseline.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
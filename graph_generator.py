@@ -1,29 +1,330 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from latency_histogram import LatencyHistogram
+
+# pandas, NumPy, matplotlib and seaborn take most of a second to import, so
+# they are imported inside the functions that use them: the CLI's --help,
+# and callers that only want the data preparation, do not pay for plotting.
 
 # --- Configuration ---
 INPUT_FILE = 'performance_data.csv'
+SAMPLES_FILE = 'performance_samples.csv'
 OUTPUT_BAR_CHART = 'performance_bar_chart.png'
 OUTPUT_BOX_PLOT = 'performance_box_plot.png'
 
+# Columns read from the samples file for the box plot
+BOX_PLOT_COLUMNS = ['Explorer', 'SearchType', 'Latency']
+
+# Cold and warm requests (performance_analyzer.py --connection-mode both)
+# are separate populations: every chart is drawn per Connection value, with
+# the value as a file name suffix when there is more than one
+CONNECTION_COLUMN = 'Connection'
+
+# Latencies simulated per summary row when there are no samples, with a
+# standard deviation of SIMULATED_STDDEV times the row's average
+SIMULATED_DRAWS = 20
+SIMULATED_STDDEV = 0.1
+
+# Charts drawn from per-request samples. Time series are cut into
+# TIMESERIES_BUCKETS slices (about one per pixel column) with rolling
+# percentiles over ROLLING_WINDOW requests; percentile curves have
+# PERCENTILE_POINTS points reaching PERCENTILE_MAX_NINES nines (99.999%).
+OUTPUT_TIMESERIES = 'performance_latency_over_time.png'
+OUTPUT_PERCENTILES = 'performance_latency_percentiles.png'
+OUTPUT_SMALL_MULTIPLES = 'performance_small_multiples.png'
+SAMPLE_CHART_COLUMNS = BOX_PLOT_COLUMNS + ['Timestamp', CONNECTION_COLUMN]
+TIMESERIES_BUCKETS = 1200
+ROLLING_WINDOW = 101
+PERCENTILE_POINTS = 500
+PERCENTILE_MAX_NINES = 5
+
+# Pre-aggregated mode: samples are read this many rows at a time, and
+# per-group statistics are saved to AGGREGATE_FILE. Whiskers reach the
+# furthest sample within WHISKER_IQR times the IQR of the box, as in
+# matplotlib; MEAN_CONFIDENCE is the level of the error bars.
+AGGREGATE_CHUNK_SIZE = 200000
+AGGREGATE_FILE = 'performance_aggregate.csv'
+WHISKER_IQR = 1.5
+MEAN_CONFIDENCE = 0.95
+
+# Backend used when neither MPLBACKEND nor an earlier pyplot import chose
+# one. Charts are only ever saved to files, so no GUI backend is needed.
+HEADLESS_BACKEND = 'Agg'
+
+# Style options shared by every chart; they are part of the cache key
+STYLE = {'style': 'whitegrid', 'palette': 'viridis', 'figsize': [12, 7]}
+
+# Each chart is rendered in its own process (up to RENDER_WORKERS, None for
+# one per CPU), and skipped when the content hash of its inputs matches the
+# one recorded in CHART_CACHE_FILE. Bump CHART_CACHE_VERSION whenever the
+# drawing code changes, so cached charts are redrawn.
+RENDER_WORKERS = None
+CHART_CACHE_FILE = '.chart_cache.json'
+CHART_CACHE_VERSION = 1
+
 # --- Main Script ---
 
-def generate_graphs(data_df):
-    """Generates and saves the performance graphs."""
+def _plotting():
+    """
+    Imports and returns (pyplot, seaborn), selecting HEADLESS_BACKEND first
+    unless the backend was already chosen, which skips matplotlib's
+    interactive backend search.
+    """
+    if 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND'):
+        import matplotlib
+        matplotlib.use(HEADLESS_BACKEND)
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+def _repeat_labels(column, draws):
+    """column with each label repeated draws times, as a categorical in order of appearance."""
+    import numpy as np
+    import pandas as pd
+    labels = pd.Categorical(column, categories=pd.unique(column))
+    return pd.Categorical.from_codes(np.repeat(labels.codes, draws), labels.categories)
+
+def box_plot_frame(data_df, samples_df=None, draws=SIMULATED_DRAWS, seed=42):
+    """
+    Builds the Explorer/SearchType/Latency frame behind the box plot.
+
+    Real samples are filtered to successful requests column-wise. Without
+    samples, draws latencies per summary row are simulated around its
+    average in one NumPy call, and the labels are expanded with np.repeat
+    as categoricals, which also keeps the frame cheap to build.
+    Returns (frame, title).
+    """
+    import numpy as np
+    import pandas as pd
+
+    if samples_df is not None:
+        box_df = samples_df.loc[samples_df['Latency'].notna(), BOX_PLOT_COLUMNS]
+        return box_df, 'Latency Distribution by Block Explorer'
+
+    # We need to generate some sample data for the box plot, as we only have averages.
+    averages = np.repeat(data_df['AverageLatency'].to_numpy(dtype=float), draws)
+    rng = np.random.RandomState(seed)
+    box_df = pd.DataFrame({
+        'Explorer': _repeat_labels(data_df['Explorer'], draws),
+        'SearchType': _repeat_labels(data_df['SearchType'], draws),
+        'Latency': rng.normal(loc=averages, scale=averages * SIMULATED_STDDEV)
+    })
+    return box_df, 'Simulated Latency Distribution by Block Explorer'
+
+def latency_timeseries(samples_df, by=('Explorer',), buckets=TIMESERIES_BUCKETS,
+                       window=ROLLING_WINDOW):
+    """
+    Downsampled latency-over-time series with rolling P50/P99 bands.
+
+    Successful samples are put in Timestamp order within each group of the
+    by columns, and P50/P99 over the group's last window requests are
+    computed at every sample. The run is then cut into buckets equal time
+    slices, and per slice each group keeps only the min and max latency
+    and the rolling percentiles at its last sample: at most buckets points
+    per group reach the plot, however many samples there are. Time is in
+    seconds from the first sample.
+    """
+    import numpy as np
+    by = list(by)
+    df = samples_df.loc[samples_df['Latency'].notna(), by + ['Timestamp', 'Latency']]
+    df = df.sort_values('Timestamp', kind='stable')
+    rolling = df.groupby(by, sort=False, observed=True)['Latency'].rolling(window, min_periods=1)
+    group_levels = list(range(len(by)))
+    df['P50'] = rolling.quantile(0.5).reset_index(level=group_levels, drop=True)
+    df['P99'] = rolling.quantile(0.99).reset_index(level=group_levels, drop=True)
+
+    start = df['Timestamp'].min()
+    span = max(df['Timestamp'].max() - start, 1e-9)
+    df['Bucket'] = np.minimum(((df['Timestamp'] - start) / span * buckets).astype(int), buckets - 1)
+    series = df.groupby(by + ['Bucket'], sort=False, observed=True).agg(
+        Time=('Timestamp', 'last'),
+        Min=('Latency', 'min'),
+        Max=('Latency', 'max'),
+        P50=('P50', 'last'),
+        P99=('P99', 'last')
+    ).reset_index()
+    series['Time'] -= start
+    return series.drop(columns='Bucket')
+
+def latency_percentiles(samples_df, by=('Explorer',), points=PERCENTILE_POINTS,
+                        max_nines=PERCENTILE_MAX_NINES):
+    """
+    Latency-by-percentile curves, one per group of the by columns.
+
+    Each group is evaluated at points percentiles spaced evenly in "nines"
+    (0%, 90%, 99%, ... up to max_nines nines), so the tail gets as many
+    points as the body; percentiles past what the group's sample count can
+    resolve are left out. Returns by columns, Percentile and Latency.
+    """
+    import numpy as np
+    import pandas as pd
+    by = list(by)
+    df = samples_df.loc[samples_df['Latency'].notna(), by + ['Latency']]
+    tails = np.logspace(0, -max_nines, points)
+    frames = []
+    for key, latencies in df.groupby(by, sort=False, observed=True)['Latency']:
+        values = latencies.to_numpy(dtype=float)
+        grid = 100 * (1 - tails[tails >= 1 / len(values)])
+        frame = pd.DataFrame({'Percentile': grid, 'Latency': np.percentile(values, grid)})
+        for position, value in enumerate(key if isinstance(key, tuple) else (key,)):
+            frame.insert(position, by[position], value)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def _iter_sample_chunks(path, chunk_size):
+    """
+    Yields the box plot columns (and Connection, if present) of a samples
+    CSV, or of each part of a Parquet directory.
+    """
+    import pandas as pd
+    columns = BOX_PLOT_COLUMNS + [CONNECTION_COLUMN]
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.parquet'):
+                frame = pd.read_parquet(os.path.join(path, name))
+                yield frame[[column for column in columns if column in frame]]
+    else:
+        yield from pd.read_csv(path, usecols=lambda column: column in columns,
+                               chunksize=chunk_size)
+
+def aggregate_samples(path, chunk_size=AGGREGATE_CHUNK_SIZE):
+    """
+    Computes box plot and bar chart statistics per (Explorer, SearchType)
+    and, if the file has one, Connection, in one streaming pass over a
+    samples file.
+
+    Each group's latencies go into a LatencyHistogram (quartiles and
+    whiskers to 0.1%) plus an exact sum and sum of squares (mean and its
+    confidence interval), so memory depends on the number of groups, not
+    of samples. Returns one row per group, in order of first appearance.
+    """
+    import numpy as np
+    import pandas as pd
+
+    groups = {}
+    by = ['Explorer', 'SearchType']
+    for chunk in _iter_sample_chunks(path, chunk_size):
+        chunk = chunk[chunk['Latency'].notna()]
+        if CONNECTION_COLUMN in chunk and len(by) == 2:
+            by.append(CONNECTION_COLUMN)
+        for key, latencies in chunk.groupby(by, sort=False)['Latency']:
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {'histogram': LatencyHistogram(), 'sum': 0.0, 'sumsq': 0.0}
+            values = latencies.to_numpy(dtype=float)
+            group['histogram'].record_many(values)
+            group['sum'] += values.sum()
+            group['sumsq'] += np.square(values).sum()
+
+    z = NormalDist().inv_cdf((1 + MEAN_CONFIDENCE) / 2)
+    rows = []
+    for key, group in groups.items():
+        histogram = group['histogram']
+        count = histogram.count
+        mean = group['sum'] / count
+        variance = max(0.0, group['sumsq'] - count * mean * mean) / (count - 1) if count > 1 else 0.0
+        margin = z * math.sqrt(variance / count)
+        q1, median, q3 = histogram.percentile(25), histogram.percentile(50), histogram.percentile(75)
+        reach = WHISKER_IQR * (q3 - q1)
+        whisker_low, whisker_high = histogram.bounds_within(q1 - reach, q3 + reach)
+        rows.append({
+            **dict(zip(by, key)),
+            'Samples': count,
+            'AverageLatency': mean,
+            'MeanCILow': mean - margin,
+            'MeanCIHigh': mean + margin,
+            'WhiskerLow': whisker_low,
+            'Q1': q1,
+            'Median': median,
+            'Q3': q3,
+            'WhiskerHigh': whisker_high,
+            'MinLatency': histogram.min / 1000,
+            'MaxLatency': histogram.max / 1000
+        })
+    return pd.DataFrame(rows)
+
+def _group_layout(summary_df):
+    """x position and width of each row's element, SearchType groups side by side."""
+    import pandas as pd
+    explorers = list(pd.unique(summary_df['Explorer']))
+    search_types = list(pd.unique(summary_df['SearchType']))
+    width = 0.8 / len(explorers)
+    positions = [
+        search_types.index(search_type) - 0.4 + width * (explorers.index(explorer) + 0.5)
+        for explorer, search_type in zip(summary_df['Explorer'], summary_df['SearchType'])
+    ]
+    return explorers, search_types, positions, width
+
+def _summary_axes(summary_df, style):
+    """Figure, axes, layout and per-explorer colours for a summary chart."""
+    plt, sns = _plotting()
+    sns.set_style(style['style'])
+    explorers, search_types, positions, width = _group_layout(summary_df)
+    colors = dict(zip(explorers, sns.color_palette(style['palette'], len(explorers))))
+    fig, ax = plt.subplots(figsize=style['figsize'])
+    ax.set_xticks(range(len(search_types)), search_types)
+    ax.set_xlabel('Search Type', fontsize=12)
+    legend = [plt.Rectangle((0, 0), 1, 1, color=colors[explorer]) for explorer in explorers]
+    ax.legend(legend, explorers, title='Explorer')
+    return plt, fig, ax, positions, width, colors
+
+def render_summary_bar_chart(summary_df, path, style=STYLE):
+    """Bar chart of aggregate_samples() means with confidence-interval error bars."""
+    plt, fig, ax, positions, width, colors = _summary_axes(summary_df, style)
+    means = summary_df['AverageLatency'].to_numpy()
+    errors = [means - summary_df['MeanCILow'].to_numpy(), summary_df['MeanCIHigh'].to_numpy() - means]
+    ax.bar(positions, means, width, yerr=errors, capsize=4,
+           color=[colors[explorer] for explorer in summary_df['Explorer']])
+    for x, mean, top in zip(positions, means, summary_df['MeanCIHigh']):
+        ax.annotate(format(mean, '.1f'), (x, top), ha='center', va='center',
+                    xytext=(0, 9), textcoords='offset points')
+    ax.set_title(f'Average Search Latency by Block Explorer ({MEAN_CONFIDENCE:.0%} CI)', fontsize=16)
+    ax.set_ylabel('Average Latency (ms)', fontsize=12)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    print(f"Bar chart saved to {path}")
+
+def render_summary_box_plot(summary_df, path, style=STYLE):
+    """Box plot drawn with Axes.bxp from aggregate_samples() quartiles and whiskers."""
+    plt, fig, ax, positions, width, colors = _summary_axes(summary_df, style)
+    stats = [
+        {'med': row.Median, 'q1': row.Q1, 'q3': row.Q3, 'whislo': row.WhiskerLow,
+         'whishi': row.WhiskerHigh, 'mean': row.AverageLatency}
+        for row in summary_df.itertuples()
+    ]
+    boxes = ax.bxp(stats, positions=positions, widths=width * 0.9, patch_artist=True,
+                   showfliers=False, manage_ticks=False)
+    for box, explorer in zip(boxes['boxes'], summary_df['Explorer']):
+        box.set_facecolor(colors[explorer])
+    ax.set_title('Latency Distribution by Block Explorer', fontsize=16)
+    ax.set_ylabel('Latency (ms)', fontsize=12)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    print(f"Box plot saved to {path}")
+
+def render_bar_chart(data_df, path, style=STYLE):
+    """Bar chart of AverageLatency per SearchType and Explorer."""
+    plt, sns = _plotting()
 
     # Set the style for the plots
-    sns.set_style("whitegrid")
+    sns.set_style(style['style'])
 
-    # --- 1. Bar Chart for Average Latency ---
-    plt.figure(figsize=(12, 7))
+    plt.figure(figsize=style['figsize'])
     bar_plot = sns.barplot(
         x='SearchType',
         y='AverageLatency',
         hue='Explorer',
         data=data_df,
-        palette='viridis'
+        palette=style['palette']
     )
     plt.title('Average Search Latency by Block Explorer', fontsize=16)
     plt.xlabel('Search Type', fontsize=12)
@@ -40,57 +341,330 @@ def generate_graphs(data_df):
                        textcoords = 'offset points')
 
     plt.tight_layout()
-    plt.savefig(OUTPUT_BAR_CHART)
-    print(f"Bar chart saved to {OUTPUT_BAR_CHART}")
+    plt.savefig(path)
+    plt.close()
+    print(f"Bar chart saved to {path}")
 
-    # --- 2. Box Plot for Latency Distribution (with simulated data) ---
-    # We need to generate some sample data for the box plot, as we only have averages.
-    np.random.seed(42)
-    box_plot_data = []
-    for index, row in data_df.iterrows():
-        # Generate 20 data points around the average latency
-        # with a realistic standard deviation.
-        simulated_latencies = np.random.normal(
-            loc=row['AverageLatency'], 
-            scale=row['AverageLatency']*0.1, # 10% standard deviation
-            size=20
-        )
-        for latency in simulated_latencies:
-            box_plot_data.append({
-                'Explorer': row['Explorer'],
-                'SearchType': row['SearchType'],
-                'Latency': latency
-            })
-    
-    box_df = pd.DataFrame(box_plot_data)
+def render_box_plot(box_df, path, title, style=STYLE):
+    """Box plot of a box_plot_frame() frame."""
+    plt, sns = _plotting()
+    sns.set_style(style['style'])
 
-    plt.figure(figsize=(12, 7))
+    plt.figure(figsize=style['figsize'])
     sns.boxplot(
         x='SearchType',
         y='Latency',
         hue='Explorer',
         data=box_df,
-        palette='viridis'
+        palette=style['palette']
     )
-    plt.title('Simulated Latency Distribution by Block Explorer', fontsize=16)
+    plt.title(title, fontsize=16)
     plt.xlabel('Search Type', fontsize=12)
     plt.ylabel('Latency (ms)', fontsize=12)
     plt.xticks(rotation=0)
     plt.legend(title='Explorer')
     plt.tight_layout()
-    plt.savefig(OUTPUT_BOX_PLOT)
-    print(f"Box plot saved to {OUTPUT_BOX_PLOT}")
+    plt.savefig(path)
+    plt.close()
+    print(f"Box plot saved to {path}")
+
+def _explorer_colors(explorers, style):
+    plt, sns = _plotting()
+    sns.set_style(style['style'])
+    return plt, dict(zip(explorers, sns.color_palette(style['palette'], len(explorers))))
+
+def _draw_bands(ax, series, color):
+    """Min-max envelope, rolling P50-P99 band and P50 line of one series."""
+    ax.fill_between(series['Time'], series['Min'], series['Max'], color=color, alpha=0.15,
+                    linewidth=0)
+    ax.fill_between(series['Time'], series['P50'], series['P99'], color=color, alpha=0.4,
+                    linewidth=0)
+    ax.plot(series['Time'], series['P50'], color=color, linewidth=1)
+
+def render_timeseries(series_df, path, style=STYLE):
+    """One panel per explorer of latency_timeseries() output, on shared axes."""
+    import pandas as pd
+    explorers = list(pd.unique(series_df['Explorer']))
+    plt, colors = _explorer_colors(explorers, style)
+    fig, axes = plt.subplots(len(explorers), 1, sharex=True, sharey=True, squeeze=False,
+                             figsize=(style['figsize'][0], 2.5 * len(explorers) + 1))
+    for ax, (explorer, series) in zip(axes[:, 0], series_df.groupby('Explorer', sort=False)):
+        _draw_bands(ax, series, colors[explorer])
+        ax.set_title(explorer, fontsize=12, loc='left')
+        ax.set_ylabel('Latency (ms)', fontsize=10)
+    axes[-1, 0].set_xlabel('Time since first request (s)', fontsize=12)
+    fig.suptitle(f'Latency over Time (rolling P50-P99 band over {ROLLING_WINDOW} requests, '
+                 'min-max envelope)', fontsize=14)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    print(f"Latency over time chart saved to {path}")
+
+def render_small_multiples(series_df, path, style=STYLE):
+    """
+    Grid of latency_timeseries(by=('Explorer', 'SearchType')) output: one
+    row per explorer, one column per search type, all on the same scale.
+    """
+    import pandas as pd
+    explorers = list(pd.unique(series_df['Explorer']))
+    search_types = list(pd.unique(series_df['SearchType']))
+    plt, colors = _explorer_colors(explorers, style)
+    fig, axes = plt.subplots(len(explorers), len(search_types), sharex=True, sharey=True,
+                             squeeze=False,
+                             figsize=(3.5 * len(search_types) + 1, 2.2 * len(explorers) + 1))
+    for (explorer, search_type), series in series_df.groupby(['Explorer', 'SearchType'],
+                                                             sort=False):
+        ax = axes[explorers.index(explorer), search_types.index(search_type)]
+        _draw_bands(ax, series, colors[explorer])
+    for column, search_type in enumerate(search_types):
+        axes[0, column].set_title(search_type, fontsize=12)
+        axes[-1, column].set_xlabel('Time (s)', fontsize=10)
+    for row, explorer in enumerate(explorers):
+        axes[row, 0].set_ylabel(f'{explorer}\nLatency (ms)', fontsize=10)
+    fig.suptitle('Latency over Time by Explorer and Search Type', fontsize=14)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    print(f"Small multiples saved to {path}")
+
+def render_percentiles(percentile_df, path, style=STYLE):
+    """
+    Latency-by-percentile curves of latency_percentiles() output, with the
+    x axis in "nines" so the tail is as wide as the body.
+    """
+    import numpy as np
+    import pandas as pd
+    explorers = list(pd.unique(percentile_df['Explorer']))
+    plt, colors = _explorer_colors(explorers, style)
+    fig, ax = plt.subplots(figsize=style['figsize'])
+    nines = 0
+    for explorer, curve in percentile_df.groupby('Explorer', sort=False):
+        x = -np.log10(1 - curve['Percentile'].to_numpy() / 100)
+        ax.plot(x, curve['Latency'], color=colors[explorer], label=explorer)
+        nines = max(nines, int(np.ceil(round(x.max(), 6))))
+    ticks = range(nines + 1)
+    ax.set_xticks(ticks, ['0%'] + [f"{100 - 10 ** (2 - tick):.{max(0, tick - 2)}f}%"
+                                   for tick in ticks[1:]])
+    ax.set_title('Latency by Percentile', fontsize=16)
+    ax.set_xlabel('Percentile', fontsize=12)
+    ax.set_ylabel('Latency (ms)', fontsize=12)
+    ax.legend(title='Explorer')
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    print(f"Percentile chart saved to {path}")
+
+# Chart types accepted by render_charts
+CHART_RENDERERS = {
+    'bar': render_bar_chart,
+    'box': render_box_plot,
+    'summary_bar': render_summary_bar_chart,
+    'summary_box': render_summary_box_plot,
+    'timeseries': render_timeseries,
+    'small_multiples': render_small_multiples,
+    'percentiles': render_percentiles,
+}
+
+def chart_key(chart, data_df, options):
+    """Content hash of everything a chart is drawn from: type, options and data."""
+    import pandas as pd
+    digest = hashlib.sha256()
+    header = [CHART_CACHE_VERSION, chart, options, [str(column) for column in data_df.columns]]
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    digest.update(pd.util.hash_pandas_object(data_df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _load_cache(cache_file):
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def _render_job(chart, data_df, path, options):
+    CHART_RENDERERS[chart](data_df, path, **options)
+
+def render_charts(jobs, workers=RENDER_WORKERS, cache_file=CHART_CACHE_FILE):
+    """
+    Renders (chart, data_df, path, options) jobs, each in its own process.
+
+    A chart whose output file exists and whose chart_key matches the one
+    recorded for that path in cache_file is skipped; cache_file=None
+    renders everything. With one stale chart, or workers=1, rendering
+    stays in this process. Returns the paths that were rendered.
+    """
+    cache = _load_cache(cache_file)
+    stale = []
+    for chart, data_df, path, options in jobs:
+        key = chart_key(chart, data_df, options)
+        if cache.get(path) == key and os.path.exists(path):
+            print(f"{path} is up to date, skipped")
+            continue
+        stale.append((chart, data_df, path, options, key))
+
+    if len(stale) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(stale))) as pool:
+            futures = [pool.submit(_render_job, chart, data_df, path, options)
+                       for chart, data_df, path, options, _ in stale]
+            for future in futures:
+                future.result()
+    else:
+        for chart, data_df, path, options, _ in stale:
+            _render_job(chart, data_df, path, options)
+
+    if cache_file and stale:
+        cache.update((path, key) for _, _, path, _, key in stale)
+        with open(cache_file + '.tmp', 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(cache_file + '.tmp', cache_file)
+    return [path for _, _, path, _, _ in stale]
+
+def _output_path(path, suffix):
+    root, extension = os.path.splitext(path)
+    return f"{root}{suffix}{extension}"
+
+def graph_jobs(data_df, samples_df=None, suffix='', style=STYLE):
+    """render_charts jobs for the bar chart and box plot, output names ending in suffix."""
+    box_df, box_title = box_plot_frame(data_df, samples_df)
+    return [
+        ('bar', data_df, _output_path(OUTPUT_BAR_CHART, suffix), {'style': style}),
+        ('box', box_df, _output_path(OUTPUT_BOX_PLOT, suffix), {'title': box_title, 'style': style}),
+    ]
+
+def summary_graph_jobs(summary_df, suffix='', style=STYLE):
+    """render_charts jobs for the charts drawn from aggregate_samples() output."""
+    return [
+        ('summary_bar', summary_df, _output_path(OUTPUT_BAR_CHART, suffix), {'style': style}),
+        ('summary_box', summary_df, _output_path(OUTPUT_BOX_PLOT, suffix), {'style': style}),
+    ]
+
+def sample_chart_jobs(samples_df, suffix='', style=STYLE):
+    """
+    render_charts jobs for the charts only per-request samples can feed:
+    percentile curves, and with a Timestamp column, latency over time per
+    explorer and small multiples per explorer and search type.
+    """
+    jobs = [('percentiles', latency_percentiles(samples_df),
+             _output_path(OUTPUT_PERCENTILES, suffix), {'style': style})]
+    if 'Timestamp' in samples_df:
+        jobs += [
+            ('timeseries', latency_timeseries(samples_df),
+             _output_path(OUTPUT_TIMESERIES, suffix), {'style': style}),
+            ('small_multiples', latency_timeseries(samples_df, ('Explorer', 'SearchType')),
+             _output_path(OUTPUT_SMALL_MULTIPLES, suffix), {'style': style}),
+        ]
+    return jobs
+
+def _population(frame, connection):
+    if frame is None or connection is None or CONNECTION_COLUMN not in frame:
+        return frame
+    return frame[frame[CONNECTION_COLUMN] == connection]
+
+def connection_groups(data_df, samples_df=None):
+    """
+    Splits a summary frame, and the matching samples, into one population
+    per Connection value, so cold and warm requests are never averaged or
+    pooled into one series. Yields (suffix, data_df, samples_df); the suffix
+    is '_cold', '_warm', ... when there are several populations and empty
+    when there is one (or no Connection column).
+    """
+    import pandas as pd
+    connections = [None]
+    if CONNECTION_COLUMN in data_df:
+        connections = list(pd.unique(data_df[CONNECTION_COLUMN]))
+    for connection in connections:
+        suffix = explorer_suffix(str(connection)) if len(connections) > 1 else ''
+        yield suffix, _population(data_df, connection), _population(samples_df, connection)
+
+def explorer_suffix(explorer):
+    """File name suffix for an explorer's chart set, e.g. '_blockchain_com'."""
+    return '_' + re.sub(r'[^a-z0-9]+', '_', explorer.lower()).strip('_')
+
+def generate_summary_graphs(summary_df, workers=RENDER_WORKERS, cache_file=CHART_CACHE_FILE):
+    """
+    Draws the bar chart and box plot from aggregate_samples() output alone,
+    so rendering time does not grow with the number of samples. Bars carry
+    confidence intervals of the mean; boxes are drawn with Axes.bxp and
+    leave out individual outliers. One set is drawn per connection_groups()
+    population.
+    """
+    jobs = [job for suffix, group, _ in connection_groups(summary_df)
+            for job in summary_graph_jobs(group, suffix)]
+    return render_charts(jobs, workers, cache_file)
+
+def generate_graphs(data_df, samples_df=None, workers=RENDER_WORKERS, cache_file=CHART_CACHE_FILE):
+    """
+    Generates and saves the performance graphs.
+
+    The box plot is drawn from the per-request samples when samples_df is
+    given, and from latencies simulated around each average otherwise. One
+    set is drawn per connection_groups() population. Charts whose inputs
+    have not changed since they were last saved are skipped (see
+    render_charts).
+    """
+    jobs = [job for suffix, data_group, samples_group in connection_groups(data_df, samples_df)
+            for job in graph_jobs(data_group, samples_group, suffix)]
+    return render_charts(jobs, workers, cache_file)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Draw the performance charts.")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="Stream the samples file into per-group statistics and draw "
+                             "from those (for very large sample files)")
+    parser.add_argument('--chunk-size', type=int, default=AGGREGATE_CHUNK_SIZE,
+                        help="Samples read at a time in --aggregate mode")
+    parser.add_argument('--per-explorer', action='store_true',
+                        help="Also draw a chart set per explorer")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS,
+                        help="Processes rendering charts (default: one per CPU)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Redraw every chart even if its inputs are unchanged")
+    args = parser.parse_args()
+    cache_file = None if args.no_cache else CHART_CACHE_FILE
+
+    import pandas as pd
     try:
-        # Read the performance data
-        performance_data = pd.read_csv(INPUT_FILE)
-        
-        # Generate the graphs
-        generate_graphs(performance_data)
-
-    except FileNotFoundError:
-        print(f"Error: The input file '{INPUT_FILE}' was not found.")
+        if args.aggregate:
+            # Only per-group statistics are held in memory, never the samples
+            summary = aggregate_samples(SAMPLES_FILE, args.chunk_size)
+            summary.to_csv(AGGREGATE_FILE, index=False)
+            print(f"Aggregated statistics saved to {AGGREGATE_FILE}")
+            jobs = []
+            for suffix, population, _ in connection_groups(summary):
+                jobs += summary_graph_jobs(population, suffix)
+                if args.per_explorer:
+                    for explorer, group in population.groupby('Explorer', sort=False):
+                        jobs += summary_graph_jobs(group, suffix + explorer_suffix(explorer))
+        else:
+            # Read the performance data
+            performance_data = pd.read_csv(INPUT_FILE)
+
+            # Use the real per-request samples for the box plot when available
+            samples_data = None
+            if os.path.exists(SAMPLES_FILE):
+                samples_data = pd.read_csv(
+                    SAMPLES_FILE, usecols=lambda column: column in SAMPLE_CHART_COLUMNS)
+
+            # One chart set per connection population (cold/warm)
+            jobs = []
+            for suffix, data, samples in connection_groups(performance_data, samples_data):
+                jobs += graph_jobs(data, samples, suffix)
+                if samples is not None:
+                    jobs += sample_chart_jobs(samples, suffix)
+                if args.per_explorer:
+                    for explorer, group in data.groupby('Explorer', sort=False):
+                        samples_group = None
+                        if samples is not None:
+                            samples_group = samples[samples['Explorer'] == explorer]
+                        jobs += graph_jobs(group, samples_group, suffix + explorer_suffix(explorer))
+
+        # Generate the graphs, each in its own process
+        render_charts(jobs, args.workers, cache_file)
+
+    except FileNotFoundError as e:
+        print(f"Error: The input file '{e.filename}' was not found.")
     except Exception as e:
         print(f"An error occurred: {e}")
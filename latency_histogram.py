@@ -0,0 +1,149 @@
+"""
+HDR-style log-bucketed latency histogram.
+
+Values are recorded as integer microseconds. Below 2**SUB_BUCKET_BITS
+microseconds every value has its own bucket; above that, each power of
+two is split into 2**(SUB_BUCKET_BITS - 1) linear sub-buckets. The
+relative error of any reported percentile is therefore below
+2**-(SUB_BUCKET_BITS - 1) (about 0.1% with the default of 11 bits), and
+memory depends only on the range of values seen, not on how many samples
+were recorded. Count, sum, min and max are tracked exactly.
+"""
+
+import math
+from statistics import NormalDist
+
+# --- Configuration ---
+
+SUB_BUCKET_BITS = 11
+
+# Percentiles reported by LatencyHistogram.summary()
+SUMMARY_PERCENTILES = {'P50': 50, 'P90': 90, 'P99': 99, 'P999': 99.9}
+
+
+class LatencyHistogram:
+    """Histogram of latencies in milliseconds with bounded relative error."""
+
+    def __init__(self, sub_bucket_bits=SUB_BUCKET_BITS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._linear_limit = 1 << sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self._linear_limit:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self._linear_limit + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _highest_equivalent(self, index):
+        """Largest value (us) that maps to the bucket at index."""
+        if index < self._linear_limit:
+            return index
+        shift, sub = divmod(index - self._linear_limit, self._half)
+        shift += 1
+        return ((sub + self._half) << shift) + (1 << shift) - 1
+
+    def record(self, latency_ms, count=1):
+        """Records a latency in milliseconds (count times)."""
+        value = max(0, round(latency_ms * 1000))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_many(self, latencies_ms):
+        """Records an array of latencies in milliseconds in one vectorized pass."""
+        import numpy as np
+        values = np.rint(np.maximum(np.asarray(latencies_ms, dtype=float), 0) * 1000)
+        values = values.astype(np.int64)
+        if not values.size:
+            return
+        # frexp's exponent is the bit length for the exactly representable
+        # integers below 2**53 (about 285 years in microseconds)
+        shift = np.maximum(np.frexp(values)[1] - self.sub_bucket_bits, 0)
+        indexes = np.where(values < self._linear_limit, values,
+                           self._linear_limit + (shift - 1) * self._half
+                           + (values >> shift) - self._half)
+        buckets, counts = np.unique(indexes, return_counts=True)
+        for index, count in zip(buckets.tolist(), counts.tolist()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        low, high = int(values.min()), int(values.max())
+        self.count += int(values.size)
+        self.total += int(values.sum())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        """Adds every sample of another histogram with the same precision."""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.count:
+            self.count += other.count
+            self.total += other.total
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def _value_at_rank(self, rank):
+        """Latency (ms) of the rank-th smallest sample (1-based)."""
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max) / 1000
+        return self.max / 1000
+
+    def percentile(self, pct):
+        """Latency (ms) at or below which pct percent of samples fall."""
+        if not self.count:
+            return None
+        return self._value_at_rank(max(1, math.ceil(pct / 100 * self.count)))
+
+    def median_ci(self, confidence=0.95):
+        """
+        Distribution-free confidence interval (low, high) in ms for the median.
+
+        The bounds are the order statistics whose ranks enclose the median
+        with the given confidence, from the normal approximation to
+        Binomial(count, 1/2), so a few extreme outliers do not widen it.
+        Returns None while there are too few samples for those ranks.
+        """
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        spread = z * math.sqrt(self.count) / 2
+        lower = math.floor(self.count / 2 - spread)
+        upper = math.ceil(self.count / 2 + spread) + 1
+        if lower < 1 or upper > self.count:
+            return None
+        return self._value_at_rank(lower), self._value_at_rank(upper)
+
+    def bounds_within(self, low_ms, high_ms):
+        """
+        Lowest and highest recorded latency (ms) in [low_ms, high_ms], to
+        bucket precision, or (None, None) if no sample falls inside.
+        """
+        inside = []
+        for index in sorted(self.counts):
+            value = max(self.min, min(self._highest_equivalent(index), self.max)) / 1000
+            if low_ms <= value <= high_ms:
+                inside.append(value)
+        return (inside[0], inside[-1]) if inside else (None, None)
+
+    def mean(self):
+        """Exact mean latency in ms."""
+        return self.total / self.count / 1000 if self.count else None
+
+    def summary(self):
+        """Count, mean, P50/P90/P99/P999 and max, all latencies in ms."""
+        row = {'Count': self.count, 'Mean': self.mean()}
+        for name, pct in SUMMARY_PERCENTILES.items():
+            row[name] = self.percentile(pct)
+        row['Max'] = self.max / 1000 if self.count else None
+        return row
@@ -0,0 +1,191 @@
+"""
+Live metrics for long performance_analyzer.py runs.
+
+LiveMetrics keeps in-process counters of completed requests and errors,
+a gauge of requests in flight, and a LatencyHistogram per explorer and
+connection type. Updating them is a dict lookup and an increment under a
+lock, so they can be fed every sample. They can be watched while a run is
+still going in two ways:
+
+    serve_metrics     Prometheus text format on http://HOST:PORT/metrics
+                      (and the JSON snapshot on /metrics.json)
+    MetricsSnapshot   the JSON snapshot rewritten every few seconds
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from latency_histogram import LatencyHistogram
+
+# --- Configuration ---
+
+METRICS_HOST = '127.0.0.1'
+SNAPSHOT_INTERVAL = 5.0
+
+# Latency quantiles exported per explorer and connection type
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class LiveMetrics:
+    """Thread-safe request counters, in-flight gauge and latency histograms."""
+
+    def __init__(self):
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.errors = {}
+        self.in_flight = {}
+        self.latency = {}
+
+    def start(self, explorer):
+        """Marks one request to explorer as sent."""
+        with self._lock:
+            self.in_flight[explorer] = self.in_flight.get(explorer, 0) + 1
+
+    def finish(self, explorer):
+        """Marks one request to explorer as answered (or failed)."""
+        with self._lock:
+            self.in_flight[explorer] -= 1
+
+    def observe(self, sample):
+        """Counts a recorded sample and adds its latency to the histograms."""
+        key = (sample['Explorer'], sample['SearchType'], sample['Connection'])
+        with self._lock:
+            status_key = key + (str(sample['Status']),)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if sample['Latency'] is None:
+                self.errors[key] = self.errors.get(key, 0) + 1
+                return
+            series = (sample['Explorer'], sample['Connection'])
+            histogram = self.latency.get(series)
+            if histogram is None:
+                histogram = self.latency[series] = LatencyHistogram()
+            histogram.record(sample['Latency'])
+
+    def snapshot(self):
+        """Current values as a JSON-serializable dict."""
+        with self._lock:
+            elapsed = time.time() - self.start_time
+            completed = sum(self.requests.values())
+            return {
+                'timestamp': time.time(),
+                'elapsed_s': elapsed,
+                'requests': completed,
+                'errors': sum(self.errors.values()),
+                'in_flight': sum(self.in_flight.values()),
+                'throughput_rps': completed / elapsed if elapsed > 0 else 0.0,
+                'explorers': [
+                    {'explorer': explorer, 'connection': connection,
+                     'in_flight': self.in_flight.get(explorer, 0), **histogram.summary()}
+                    for (explorer, connection), histogram in self.latency.items()
+                ]
+            }
+
+    def prometheus(self):
+        """Current values in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += ['# HELP explorer_requests_total Requests completed, by response status.',
+                      '# TYPE explorer_requests_total counter']
+            for (explorer, search_type, connection, status), count in self.requests.items():
+                labels = _labels(explorer=explorer, search_type=search_type,
+                                 connection=connection, status=status)
+                lines.append(f'explorer_requests_total{labels} {count}')
+
+            lines += ['# HELP explorer_errors_total Requests that failed or returned an error.',
+                      '# TYPE explorer_errors_total counter']
+            for (explorer, search_type, connection), count in self.errors.items():
+                labels = _labels(explorer=explorer, search_type=search_type,
+                                 connection=connection)
+                lines.append(f'explorer_errors_total{labels} {count}')
+
+            lines += ['# HELP explorer_requests_in_flight Requests sent and not yet answered.',
+                      '# TYPE explorer_requests_in_flight gauge']
+            for explorer, count in self.in_flight.items():
+                lines.append(f'explorer_requests_in_flight{_labels(explorer=explorer)} {count}')
+
+            lines += ['# HELP explorer_latency_ms Latency of successful requests in ms.',
+                      '# TYPE explorer_latency_ms summary']
+            for (explorer, connection), histogram in self.latency.items():
+                for quantile in QUANTILES:
+                    labels = _labels(explorer=explorer, connection=connection,
+                                     quantile=quantile)
+                    lines.append(f'explorer_latency_ms{labels} {histogram.percentile(quantile * 100)}')
+                labels = _labels(explorer=explorer, connection=connection)
+                lines.append(f'explorer_latency_ms_sum{labels} {histogram.total / 1000}')
+                lines.append(f'explorer_latency_ms_count{labels} {histogram.count}')
+
+        lines += ['# HELP analyzer_start_time_seconds Unix time the run started.',
+                  '# TYPE analyzer_start_time_seconds gauge',
+                  f'analyzer_start_time_seconds {self.start_time}']
+        return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body, content_type = self.server.metrics.prometheus(), PROMETHEUS_CONTENT_TYPE
+        elif self.path == '/metrics.json':
+            body, content_type = json.dumps(self.server.metrics.snapshot()), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        body = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(metrics, port, host=METRICS_HOST):
+    """Serves metrics from a daemon thread; returns the server (call shutdown())."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class MetricsSnapshot:
+    """Rewrites a JSON snapshot of metrics to path every interval seconds."""
+
+    def __init__(self, metrics, path, interval=SNAPSHOT_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+    def write(self):
+        # Written under a temporary name and renamed, so readers never see
+        # a half-written file
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+        os.replace(self.path + '.tmp', self.path)
+
+    def stop(self):
+        """Stops the thread and writes a final snapshot."""
+        self._stopped.set()
+        self._thread.join()
+        self.write()
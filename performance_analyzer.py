@@ -1,6 +1,23 @@
+import argparse
+import asyncio
+import csv
+import http.client
+import io
+import json
+import os
+import random
 import requests
+import socket
+import ssl
 import time
+import urllib3
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlsplit
+from latency_histogram import LatencyHistogram
+from explorer_matrix import Target, load_matrix
+from live_metrics import LiveMetrics, MetricsSnapshot, SNAPSHOT_INTERVAL, serve_metrics
 
 # --- Configuration ---
 
@@ -11,6 +28,22 @@ EXPLORERS = {
     'BTC.com': 'https://btc.com/'
 }
 
+# URL template per explorer for the built-in EXPLORERS/TEST_DATA matrix;
+# {base_url}, {search_type} and {value} are substituted. Other targets are
+# configured with a matrix file (see explorer_matrix.py)
+URL_TEMPLATES = {
+    'Blockonomics': '{base_url}{value}',
+    'Blockchain.com': '{base_url}{search_type}/{value}',
+    'BTC.com': '{base_url}{value}'
+}
+
+# Paths the local stub explorer (stub_explorer.py) serves for each explorer
+STUB_PATHS = {
+    'Blockonomics': '/api/search?q=',
+    'Blockchain.com': '/btc/',
+    'BTC.com': '/'
+}
+
 # Test data
 TEST_DATA = {
     'transaction': 'a1075db55d416d3ca199f55b6084e2115b9345e16c5cf302fc80e9d5fbf5d48d',
@@ -18,70 +51,967 @@ TEST_DATA = {
     'block': '904512'
 }
 
-# Number of times to run each test to get an average
+# Number of times to run each test to get an average, and warmup requests
+# per explorer and search type sent first and left out of the statistics
+# (the first request pays for DNS and TLS setup)
 NUM_RUNS = 5
+NUM_WARMUP = 1
+
+# Adaptive mode: keep sampling a cell past NUM_RUNS until the confidence
+# interval of its median is narrower than ADAPTIVE_CI_WIDTH times the
+# median, or ADAPTIVE_MAX_RUNS runs have been sent
+ADAPTIVE_CI_WIDTH = 0.10
+ADAPTIVE_CONFIDENCE = 0.95
+ADAPTIVE_MAX_RUNS = 50
+
+# Maximum requests in flight across all explorers, and per explorer
+GLOBAL_CONCURRENCY = 12
+PER_EXPLORER_CONCURRENCY = 4
+
+# Output files: per-series summary, and one row per request (long format)
+OUTPUT_FILE = 'performance_data.csv'
+SAMPLES_FILE = 'performance_samples.csv'
+
+# Samples are fsync'd in batches of this size, and each committed batch is
+# listed in the manifest so an interrupted run can be resumed. A samples
+# file's manifest is named after it: <samples file>MANIFEST_SUFFIX
+SAMPLE_BATCH_SIZE = 50
+MANIFEST_SUFFIX = '.manifest.jsonl'
+
+# Per-request timeout in seconds, and redirects followed by the phase probe
+REQUEST_TIMEOUT = 15
+MAX_REDIRECTS = 5
+
+# Per-phase columns recorded for every request (ms, plus response size)
+PHASES = ('DNS', 'Connect', 'TLS', 'TTFB', 'Body', 'Bytes')
+
+SAMPLE_COLUMNS = ['Explorer', 'SearchType', 'Value', 'Connection', 'Run', 'Timestamp', 'Latency',
+                  'Status', *PHASES, 'ServiceTime']
+
+# 'cold' opens a fresh TCP/TLS connection for every request, 'warm' reuses
+# pooled keep-alive connections per explorer host, 'both' measures each
+CONNECTION_MODE = 'cold'
+CONNECTION_MODES = ('cold', 'warm', 'both')
+
+# Keep-alive connections kept open per explorer host in warm mode
+POOL_SIZE = PER_EXPLORER_CONCURRENCY
+
+# Open-loop mode: target arrival rate (requests/s) and duration (s) per
+# explorer, arrival process, and the cap on threads sending requests
+OPEN_LOOP_RATE = 5.0
+OPEN_LOOP_DURATION = 30.0
+ARRIVAL_PROCESSES = ('constant', 'poisson')
+OPEN_LOOP_MAX_IN_FLIGHT = 256
+THROUGHPUT_FILE = 'performance_throughput.csv'
 
 # --- Main Script ---
 
-def measure_latency(url):
-    """Measures the latency of a single HTTP GET request."""
+def explorer_targets(explorers=EXPLORERS, test_data=TEST_DATA, num_runs=NUM_RUNS,
+                     warmup=NUM_WARMUP):
+    """The EXPLORERS/TEST_DATA matrix as Targets; explorers without a template are left out."""
+    targets = []
+    for explorer_name, base_url in explorers.items():
+        template = URL_TEMPLATES.get(explorer_name)
+        if template is None:
+            continue
+        template = template.replace('{base_url}', base_url)
+        targets.append(Target(explorer_name, dict.fromkeys(test_data, template), test_data,
+                              num_runs, warmup))
+    return targets
+
+def stub_explorers(base_url):
+    """EXPLORERS pointed at a stub explorer server instead of the live hosts."""
+    base_url = base_url.rstrip('/')
+    return {name: f"{base_url}{path}" for name, path in STUB_PATHS.items()}
+
+class SessionPool:
+    """
+    One pooled keep-alive requests.Session per explorer host. With block,
+    a request waits for one of the pool_size connections to come free
+    instead of opening (and then discarding) an extra one.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, block=False):
+        self.pool_size = pool_size
+        self.block = block
+        self._sessions = {}
+
+    def get(self, url):
+        """Returns the session for the host of url, creating it on first use."""
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                                  pool_block=self.block)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._sessions[host] = session
+        return session
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+def _ms(start_ns, end_ns):
+    return (end_ns - start_ns) / 1e6
+
+def _failed(status, phases=None):
+    """Measurement record for a request that did not succeed."""
+    return {'Latency': None, 'Status': status, **(phases or dict.fromkeys(PHASES, None))}
+
+def _connect(addresses):
+    """
+    Connects to the first reachable getaddrinfo() address, trying them in
+    order as urllib3 does (e.g. IPv6 then IPv4); re-raises the last error if
+    none is reachable.
+    """
+    error = None
+    for family, socktype, proto, _, address in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.settimeout(REQUEST_TIMEOUT)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error or OSError("getaddrinfo returned no addresses")
+
+def _probe_headers():
+    """The headers requests sends by default, asking to close the connection."""
+    headers = dict(requests.utils.default_headers())
+    headers['Connection'] = 'close'
+    return headers
+
+def _decode_body(body, headers):
+    """body decoded per its Content-Encoding the way requests decodes it (via urllib3)."""
+    response = urllib3.HTTPResponse(body=io.BytesIO(body), headers=headers,
+                                    preload_content=False, decode_content=True)
+    return response.read()
+
+def _probe(url, phases):
+    """
+    Performs one GET on a brand-new connection, timing each phase.
+
+    The request carries the same headers as requests.get (so the response
+    is compressed the same way as on warm requests), and the body is
+    decoded the same way before it is counted. Phase durations (ms) and the
+    body size are added to phases; TLS only for https. Returns (status,
+    location) where location is set for redirects.
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    t0 = time.perf_counter_ns()
+    addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    t1 = time.perf_counter_ns()
+    sock = _connect(addresses)
+    try:
+        t2 = time.perf_counter_ns()
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        t3 = time.perf_counter_ns()
+
+        connection_class = http.client.HTTPSConnection if secure else http.client.HTTPConnection
+        connection = connection_class(host, port, timeout=REQUEST_TIMEOUT)
+        connection.sock = sock
+        connection.request('GET', path, headers=_probe_headers())
+        response = connection.getresponse()
+        t4 = time.perf_counter_ns()
+        body = _decode_body(response.read(), dict(response.getheaders()))
+        t5 = time.perf_counter_ns()
+    finally:
+        sock.close()
+
+    phases['DNS'] += _ms(t0, t1)
+    phases['Connect'] += _ms(t1, t2)
+    if secure:
+        phases['TLS'] = (phases['TLS'] or 0) + _ms(t2, t3)
+    phases['TTFB'] += _ms(t3, t4)
+    phases['Body'] += _ms(t4, t5)
+    phases['Bytes'] += len(body)
+    return response.status, response.getheader('Location')
+
+def measure_phases(url):
+    """
+    Measures a cold GET request phase by phase.
+
+    DNS resolution, TCP connect, TLS handshake, time to first byte (request
+    sent until the response headers arrive) and body transfer are timed
+    separately with perf_counter_ns. Redirects are followed, each on a new
+    connection, and their phases are summed. Connect includes any resolved
+    addresses that had to be skipped as unreachable. TLS is left empty for
+    plain http.
+
+    The request goes straight to the host: HTTP(S)_PROXY environment
+    variables are not honoured, unlike requests.get, so on a network that
+    only allows proxied traffic use warm mode, which goes through requests.
+    """
+    phases = dict.fromkeys(PHASES, 0)
+    phases['TLS'] = None  # Stays empty unless a hop is https
+    start = time.perf_counter_ns()
     try:
-        start_time = time.time()
-        response = requests.get(url, timeout=15)
-        end_time = time.time()
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = _probe(url, phases)
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            break
+        latency = _ms(start, time.perf_counter_ns())
+    except (OSError, http.client.HTTPException) as e:
+        print(f"Error fetching {url}: {e}")
+        return _failed(type(e).__name__)
+    if status >= 400:
+        print(f"Error fetching {url}: HTTP {status}")
+        return _failed(status, phases)
+    return {'Latency': latency, 'Status': status, **phases}
+
+def measure_request(url, session=None):
+    """
+    Measures a single HTTP GET request and returns a measurement record.
+
+    The record holds the total latency (ms, None on failure), the status and
+    the per-phase breakdown listed in PHASES. Without a session the request
+    goes over a fresh connection and every phase is timed (cold); with a
+    pooled session an idle keep-alive connection is reused, so DNS, connect
+    and TLS are zero and only TTFB and body transfer are timed (warm). TLS
+    is left empty for plain http either way.
+
+    If the pool had to open a connection for a warm request (the server
+    dropped keep-alive, or the pool was exhausted), its setup cost is part
+    of TTFB and cannot be split, so DNS, connect and TLS are left empty
+    rather than reported as zero.
+    """
+    if session is None:
+        return measure_phases(url)
+    try:
+        start = time.perf_counter_ns()
+        response = session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+        headers_received = time.perf_counter_ns()
+        reused = _reused_connection(response)
+        body = response.content
+        end = time.perf_counter_ns()
         response.raise_for_status()  # Raise an exception for bad status codes
-        return (end_time - start_time) * 1000  # Return latency in milliseconds
     except requests.exceptions.RequestException as e:
         print(f"Error fetching {url}: {e}")
+        status = e.response.status_code if e.response is not None else type(e).__name__
+        return _failed(status)
+    setup = 0.0 if reused else None
+    return {
+        'Latency': _ms(start, end),
+        'Status': response.status_code,
+        'DNS': setup,
+        'Connect': setup,
+        'TLS': setup if urlsplit(response.url).scheme == 'https' else None,
+        'TTFB': _ms(start, headers_received),
+        'Body': _ms(headers_received, end),
+        'Bytes': len(body)
+    }
+
+def _reused_connection(response):
+    """
+    True if a pooled response came over a connection that had already
+    served a request. Each urllib3 connection is tagged with the socket it
+    was last used with; a new connection, or one that reconnected on a new
+    socket, does not match its tag.
+    """
+    connection = getattr(response.raw, 'connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        return False
+    reused = getattr(connection, '_analyzer_sock', None) is sock
+    connection._analyzer_sock = sock
+    return reused
+
+def measure_latency(url):
+    """Measures the latency of a single HTTP GET request."""
+    return measure_request(url)['Latency']
+
+def _parse_sample(row):
+    """Converts a samples-file row back into a sample dict with numeric fields."""
+    sample = dict(row)
+    for column in ('Timestamp', 'Latency', *PHASES, 'ServiceTime'):
+        value = sample.get(column)
+        sample[column] = None if value is None or value == '' or value != value else float(value)
+    sample['Run'] = int(sample['Run'])
+    status = str(sample['Status'])
+    sample['Status'] = int(status) if status.isdigit() else status
+    return sample
+
+def manifest_path(samples_file):
+    """The manifest that records committed batches of samples_file."""
+    return samples_file.rstrip('/' + os.sep) + MANIFEST_SUFFIX
+
+def _fsync_append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+class SampleRecorder:
+    """
+    Receives every sample as it completes.
+
+    Each sample is folded into a per-series (Explorer, SearchType,
+    Connection) latency histogram and phase totals, so percentiles can be
+    reported without holding the samples in memory; keep_samples also keeps
+    them in a list. With a samples file, samples are appended in batches of
+    batch_size: each batch is written and fsync'd first, then a line naming
+    its (Explorer, SearchType, Connection, Run) cells and the file position
+    is fsync'd to the manifest. A file ending in .parquet is a directory of
+    one part file per batch.
+
+    With resume, cells already in the manifest are reported by is_done, any
+    data written after the last manifest entry is discarded, and the kept
+    samples are folded back into the statistics. Only successful samples
+    mark their cell done, so failed runs are retried (their failures still
+    count as errors). Resuming needs the manifest and the data it commits:
+    without them FileNotFoundError is raised and nothing is truncated.
+
+    Recorded samples are also counted by metrics (a LiveMetrics), if given.
+    """
+
+    def __init__(self, samples_file=None, keep_samples=False, manifest_file=None, resume=False,
+                 batch_size=SAMPLE_BATCH_SIZE, metrics=None):
+        self.samples = [] if keep_samples else None
+        self.metrics = metrics
+        self.series = {}
+        self.done = set()
+        self.samples_file = samples_file
+        self.manifest_file = manifest_file
+        self.batch_size = batch_size
+        self._parquet = bool(samples_file) and samples_file.endswith('.parquet')
+        self._batch = []
+        self._parts = []
+        self._file = None
+        self._writer = None
+        if not samples_file:
+            return
+
+        offset = 0
+        if resume:
+            if not manifest_file or not os.path.exists(manifest_file):
+                raise FileNotFoundError(f"Cannot resume {samples_file}: it has no manifest "
+                                        f"({manifest_file}) recording what was committed")
+            offset = self._load_manifest()
+        elif manifest_file:
+            open(manifest_file, 'w').close()
+
+        if self._parquet:
+            self._open_parquet(resume)
+        else:
+            self._open_csv(resume, offset)
+
+    def _load_manifest(self):
+        """
+        Reads done cells and the last committed position from the manifest,
+        and cuts the manifest back to its last complete entry.
+        """
+        offset = 0
+        valid_end = 0
+        with open(self.manifest_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn final line from a crash mid-write
+                valid_end += len(line)
+                self.done.update(tuple(cell) for cell in entry['cells'])
+                offset = entry.get('offset', offset)
+                if 'part' in entry:
+                    self._parts.append(entry['part'])
+        self._check_committed(offset)
+        # Later entries are appended after this point; left in place, a torn
+        # line would swallow the next one and hide every later commit
+        with open(self.manifest_file, 'r+b') as f:
+            f.truncate(valid_end)
+            os.fsync(f.fileno())
+        return offset
+
+    def _check_committed(self, offset):
+        """Raises FileNotFoundError unless all committed data is still on disk."""
+        if self._parquet:
+            missing = [name for name in self._parts
+                       if not os.path.exists(os.path.join(self.samples_file, name))]
+            if missing:
+                raise FileNotFoundError(f"Cannot resume {self.samples_file}: committed parts "
+                                        f"{missing[:3]} are missing")
+        elif offset and (not os.path.exists(self.samples_file)
+                         or os.path.getsize(self.samples_file) < offset):
+            raise FileNotFoundError(f"Cannot resume {self.samples_file}: it is missing or "
+                                    f"shorter than the {offset} committed bytes")
+
+    def _open_csv(self, resume, offset):
+        if resume and offset:
+            with open(self.samples_file, 'r+') as f:
+                f.truncate(offset)
+            with open(self.samples_file, newline='') as f:
+                for row in csv.DictReader(f):
+                    self._fold(_parse_sample(row))
+        else:
+            offset = 0
+        self._file = open(self.samples_file, 'a' if offset else 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=SAMPLE_COLUMNS)
+        if not offset:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def _open_parquet(self, resume):
+        os.makedirs(self.samples_file, exist_ok=True)
+        committed = set(self._parts) if resume else set()
+        for name in os.listdir(self.samples_file):
+            if name not in committed:
+                os.remove(os.path.join(self.samples_file, name))
+        for name in self._parts if resume else []:
+            frame = pd.read_parquet(os.path.join(self.samples_file, name))
+            for row in frame.to_dict('records'):
+                self._fold(_parse_sample(row))
+        if not resume:
+            self._parts = []
+
+    def add_series(self, key):
+        """Registers a series so the summary lists it in registration order."""
+        return self.series.setdefault(key, {
+            'histogram': LatencyHistogram(),
+            'totals': dict.fromkeys(('Latency',) + PHASES, 0.0),
+            'counts': dict.fromkeys(('Latency',) + PHASES, 0),
+            'errors': 0
+        })
+
+    def is_done(self, cell):
+        """True if the (Explorer, SearchType, Connection, Run) cell was committed."""
+        return cell in self.done
+
+    def _fold(self, sample):
+        series = self.add_series((sample['Explorer'], sample['SearchType'], sample['Connection']))
+        if sample['Latency'] is None:
+            series['errors'] += 1
+            return
+        series['histogram'].record(sample['Latency'])
+        for column in series['totals']:
+            # Setup phases of a warm request on a new connection are empty
+            if sample[column] is not None:
+                series['totals'][column] += sample[column]
+                series['counts'][column] += 1
+
+    def record(self, sample):
+        if self.samples is not None:
+            self.samples.append(sample)
+        self._fold(sample)
+        if self.metrics is not None:
+            self.metrics.observe(sample)
+        if self.samples_file:
+            self._batch.append(sample)
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Writes and fsyncs the pending batch, then commits it to the manifest."""
+        if not self._batch:
+            return
+        # Failed runs are not marked done, so a resumed run retries them
+        entry = {'cells': [[s['Explorer'], s['SearchType'], s['Connection'], s['Run']]
+                           for s in self._batch if s['Latency'] is not None]}
+        if self._parquet:
+            name = f"part-{len(self._parts):06d}.parquet"
+            path = os.path.join(self.samples_file, name)
+            frame = pd.DataFrame(self._batch, columns=SAMPLE_COLUMNS)
+            frame['Status'] = frame['Status'].astype(str)
+            frame.to_parquet(path + '.tmp', index=False)
+            with open(path + '.tmp', 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+            self._parts.append(name)
+            entry['part'] = name
+        else:
+            self._writer.writerows(self._batch)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            entry['offset'] = self._file.tell()
+        if self.manifest_file:
+            _fsync_append(self.manifest_file, json.dumps(entry) + '\n')
+        self.done.update(tuple(cell) for cell in entry['cells'])
+        self._batch = []
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def summary(self):
+        """
+        Builds the Explorer/SearchType/Connection/AverageLatency frame, with
+        P50/P90/P99/P99.9/Max latency from the histograms, the confidence
+        interval of the median, the mean of every phase (over the samples
+        that have it) as Average<Phase>, and sample and error counts.
+        """
+        results = []
+        for (explorer_name, search_type, connection), series in self.series.items():
+            histogram = series['histogram']
+            if not histogram.count:
+                continue
+            stats = histogram.summary()
+            row = {
+                'Explorer': explorer_name,
+                'SearchType': search_type,
+                'Connection': connection,
+                'AverageLatency': series['totals']['Latency'] / histogram.count
+            }
+            for name in ('P50', 'P90', 'P99', 'P999', 'Max'):
+                row[f'{name}Latency'] = stats[name]
+            interval = histogram.median_ci(ADAPTIVE_CONFIDENCE)
+            row['P50CILow'], row['P50CIHigh'] = interval or (None, None)
+            for phase in PHASES:
+                count = series['counts'][phase]
+                row[f'Average{phase}'] = series['totals'][phase] / count if count else None
+            row['Samples'] = histogram.count
+            row['Errors'] = series['errors']
+            results.append(row)
+        return pd.DataFrame(results)
+
+async def _measure(executor, recorder, explorer_name, url, session):
+    """Runs measure_request in the executor, counted as in flight in the live metrics."""
+    loop = asyncio.get_running_loop()
+    metrics = recorder.metrics
+    if metrics is not None:
+        metrics.start(explorer_name)
+    try:
+        return await loop.run_in_executor(executor, measure_request, url, session)
+    finally:
+        if metrics is not None:
+            metrics.finish(explorer_name)
+
+async def _target_worker(target, jobs, global_limit, executor, recorder, sessions=None):
+    """Pulls jobs for one target and records one sample per measured request."""
+    loop = asyncio.get_running_loop()
+    connection = 'cold' if sessions is None else 'warm'
+    primed = False
+    for search_type, value, run, url, warmup in jobs:
+        session = sessions.get(url) if sessions is not None else None
+        async with global_limit:
+            if session is not None and not primed:
+                # Open this worker's pooled connection outside the measurement
+                await loop.run_in_executor(executor, measure_request, url, session)
+                primed = True
+            timestamp = time.time()
+            measurement = await _measure(executor, recorder, target.name, url, session)
+        if warmup:
+            continue
+        recorder.record({
+            'Explorer': target.name,
+            'SearchType': search_type.capitalize(),
+            'Value': value,
+            'Connection': connection,
+            'Run': run,
+            'Timestamp': timestamp,
+            **measurement
+        })
+        latency = measurement['Latency']
+        result = f"{latency:.2f} ms" if latency is not None else "Failed"
+        print(f"  - {target.name} ({connection}): run {run} for {search_type} '{value[:10]}...' -> {result}")
+
+def _needs_more(series, run, ci_width, max_runs):
+    """
+    True while a cell is under its run budget and the confidence interval of
+    its median is wider than ci_width times the median.
+    """
+    if run >= max_runs:
+        return False
+    histogram = series['histogram']
+    interval = histogram.median_ci(ADAPTIVE_CONFIDENCE)
+    if interval is None:
+        return True
+    return interval[1] - interval[0] > ci_width * histogram.percentile(50)
+
+async def _run_pass(targets, concurrency, per_explorer_concurrency, recorder, sessions=None,
+                    adaptive=None):
+    """
+    Runs every job once, on fresh connections or on the given session pool.
+    adaptive is a (ci_width, max_runs) pair that extends each cell's runs.
+    """
+    global_limit = asyncio.Semaphore(concurrency)
+    connection = 'cold' if sessions is None else 'warm'
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        workers = []
+        for target in targets:
+            def skip(search_type, run, name=target.name):
+                return recorder.is_done((name, search_type.capitalize(), connection, run))
+            def more(search_type, run, name=target.name):
+                series = recorder.add_series((name, search_type.capitalize(), connection))
+                return _needs_more(series, run, *adaptive)
+            jobs = target.jobs(skip, more if adaptive is not None else None)
+            num_workers = target.concurrency or per_explorer_concurrency
+            if sessions is not None:
+                # More workers than pooled connections would open uncounted cold ones
+                num_workers = min(num_workers, sessions.pool_size)
+            workers += [
+                _target_worker(target, jobs, global_limit, executor, recorder, sessions)
+                for _ in range(num_workers)
+            ]
+        await asyncio.gather(*workers)
+
+def _register_series(recorder, targets, connections):
+    # Report in configuration order rather than completion order
+    for target in targets:
+        for search_type in target.search_types:
+            for connection in connections:
+                recorder.add_series((target.name, search_type.capitalize(), connection))
+
+async def collect_samples(explorers=EXPLORERS, test_data=TEST_DATA, num_runs=NUM_RUNS,
+                          concurrency=GLOBAL_CONCURRENCY,
+                          per_explorer_concurrency=PER_EXPLORER_CONCURRENCY,
+                          connection_mode=CONNECTION_MODE, pool_size=POOL_SIZE, recorder=None,
+                          targets=None, warmup=NUM_WARMUP, adaptive=False,
+                          ci_width=ADAPTIVE_CI_WIDTH, max_runs=ADAPTIVE_MAX_RUNS):
+    """
+    Runs every request concurrently and feeds each sample to a SampleRecorder.
+
+    targets (from a matrix file) replace the explorers/test_data/num_runs
+    matrix. Each target gets its own concurrency (or per_explorer_concurrency)
+    workers pulling from its lazily generated jobs, and a shared semaphore
+    caps the total number of requests in flight. Blocking requests run in a
+    thread pool, so each sample still times exactly one request. In 'both'
+    connection mode a cold pass runs first, then a warm pass over pooled
+    sessions.
+
+    Warmup requests go out first for every target and search type and are
+    not recorded. In adaptive mode each cell keeps being sampled after its
+    configured runs until the confidence interval of its median is narrower
+    than ci_width times the median or max_runs is reached; the check runs as
+    jobs are handed out, so up to the target's concurrency more requests
+    than needed may already be in flight when a cell converges.
+
+    Returns the recorder; without one, a recorder that keeps every sample in
+    memory is created.
+    """
+    if connection_mode not in CONNECTION_MODES:
+        raise ValueError(f"connection_mode must be one of {CONNECTION_MODES}")
+    if recorder is None:
+        recorder = SampleRecorder(keep_samples=True)
+    if targets is None:
+        targets = explorer_targets(explorers, test_data, num_runs, warmup)
+    adaptive = (ci_width, max_runs) if adaptive else None
+    connections = ['cold', 'warm'] if connection_mode == 'both' else [connection_mode]
+    _register_series(recorder, targets, connections)
+
+    if 'cold' in connections:
+        await _run_pass(targets, concurrency, per_explorer_concurrency, recorder,
+                        adaptive=adaptive)
+    if 'warm' in connections:
+        sessions = SessionPool(pool_size)
+        try:
+            await _run_pass(targets, concurrency, per_explorer_concurrency, recorder, sessions,
+                            adaptive)
+        finally:
+            sessions.close()
+    return recorder
+
+def _arrival_offsets(rate, duration, arrival, rng):
+    """Yields intended send times (s after the start) for the arrival process."""
+    offset = 0.0
+    while True:
+        if arrival == 'poisson':
+            offset += rng.expovariate(rate)
+        if offset >= duration:
+            return
+        yield offset
+        if arrival == 'constant':
+            offset += 1 / rate
+
+def _request_cycle(target):
+    """
+    Endlessly yields (search_type, value, url), taking search types in turn
+    and re-reading a type's values once they run out.
+    """
+    values = {search_type: target.values(search_type) for search_type in target.search_types}
+    while values:
+        for search_type in list(values):
+            value = next(values[search_type], None)
+            if value is None:
+                values[search_type] = target.values(search_type)
+                value = next(values[search_type], None)
+            if value is None:
+                del values[search_type]
+                continue
+            yield search_type, value, target.url(search_type, value)
+
+async def _open_loop_target(target, rate, duration, arrival, executor, recorder, sessions, rng):
+    """Fires requests at one target on schedule; returns its throughput record."""
+    loop = asyncio.get_running_loop()
+    connection = 'cold' if sessions is None else 'warm'
+    cycle = _request_cycle(target)
+    first = next(cycle, None)
+    if first is None:
         return None
+    session = sessions.get(first[2]) if sessions is not None else None
+    if session is not None:
+        # Open every pooled connection up front, with overlapping requests
+        # so each one needs its own, so no measured request pays for setup
+        await asyncio.gather(*(loop.run_in_executor(executor, measure_request, first[2], session)
+                               for _ in range(sessions.pool_size)))
+    for _ in range(target.warmup):
+        await loop.run_in_executor(executor, measure_request, first[2], session)
+    completions = []
 
-def run_tests():
-    """Runs the performance tests for all explorers and all data types."""
-    results = []
+    async def send(run, search_type, value, url, intended_ns):
+        session = sessions.get(url) if sessions is not None else None
+        measurement = await _measure(executor, recorder, target.name, url, session)
+        done_ns = time.perf_counter_ns()
+        completions.append(done_ns)
+        service_time = measurement['Latency']
+        recorder.record({
+            'Explorer': target.name,
+            'SearchType': search_type.capitalize(),
+            'Value': value,
+            'Connection': connection,
+            'Run': run,
+            'Timestamp': start_wall + (intended_ns - start_ns) / 1e9,
+            **measurement,
+            # Latency counts from the intended send time, so time spent
+            # queued behind earlier requests is included
+            'Latency': _ms(intended_ns, done_ns) if service_time is not None else None,
+            'ServiceTime': service_time
+        })
 
-    print("Starting performance analysis...")
+    tasks = []
+    start_wall = time.time()
+    start_ns = time.perf_counter_ns()
+    for run, offset in enumerate(_arrival_offsets(rate, duration, arrival, rng), start=1):
+        intended_ns = start_ns + int(offset * 1e9)
+        delay = (intended_ns - time.perf_counter_ns()) / 1e9
+        if delay > 0:
+            await asyncio.sleep(delay)
+        search_type, value, url = first if run == 1 else next(cycle)
+        tasks.append(asyncio.ensure_future(send(run, search_type, value, url, intended_ns)))
+    sent_ns = time.perf_counter_ns()
+    await asyncio.gather(*tasks)
+
+    window = duration * 1e9
+    completed = sum(1 for done_ns in completions if done_ns - start_ns <= window)
+    return {
+        'Explorer': target.name,
+        'Connection': connection,
+        'Arrival': arrival,
+        'TargetRate': rate,
+        'SendRate': len(tasks) / max(_ms(start_ns, sent_ns) / 1000, duration),
+        'AchievedRate': completed / duration,
+        'Sent': len(tasks),
+        'CompletedInWindow': completed
+    }
 
-    for explorer_name, base_url in EXPLORERS.items():
-        print(f"\nTesting {explorer_name}...")
-        for search_type, value in TEST_DATA.items():
-            latencies = []
-            for i in range(NUM_RUNS):
-                # Construct the correct URL for each explorer and search type
-                if explorer_name == 'Blockonomics':
-                    url = f"{base_url}{value}"
-                elif explorer_name == 'Blockchain.com':
-                    url = f"{base_url}{search_type}/{value}"
-                elif explorer_name == 'BTC.com':
-                    url = f"{base_url}{value}"
-                else:
-                    continue
-
-                print(f"  - Run {i+1}/{NUM_RUNS} for {search_type} '{value[:10]}...'", end='')
-                latency = measure_latency(url)
-                if latency is not None:
-                    latencies.append(latency)
-                    print(f" -> {latency:.2f} ms")
-                else:
-                    print(" -> Failed")
-
-            if latencies:
-                avg_latency = sum(latencies) / len(latencies)
-                results.append({
-                    'Explorer': explorer_name,
-                    'SearchType': search_type.capitalize(),
-                    'AverageLatency': avg_latency
-                })
-
-    return pd.DataFrame(results)
+async def run_open_loop(explorers=EXPLORERS, test_data=TEST_DATA, rate=OPEN_LOOP_RATE,
+                        duration=OPEN_LOOP_DURATION, arrival='constant',
+                        connection_mode=CONNECTION_MODE, pool_size=POOL_SIZE,
+                        max_in_flight=OPEN_LOOP_MAX_IN_FLIGHT, recorder=None, seed=None,
+                        targets=None):
+    """
+    Open-loop load: sends requests at a target arrival rate, whether or not
+    earlier requests have finished.
+
+    Each target (by default built from explorers and test_data) is driven in
+    turn for duration seconds, cycling through its search types and values,
+    with constant or Poisson inter-arrival times. Latency is measured from
+    each request's intended send time, so queueing delay is not hidden the
+    way it is in the closed loop (coordinated omission); the request's own
+    duration is kept as ServiceTime. Returns the recorder and a frame
+    comparing achieved with target throughput per target.
+
+    Warm requests share a primed, blocking pool of pool_size connections
+    per host: past pool_size in flight they queue for a connection rather
+    than open a cold one, and that wait counts in ServiceTime as well as
+    Latency.
+    """
+    if arrival not in ARRIVAL_PROCESSES:
+        raise ValueError(f"arrival must be one of {ARRIVAL_PROCESSES}")
+    if connection_mode not in CONNECTION_MODES:
+        raise ValueError(f"connection_mode must be one of {CONNECTION_MODES}")
+    if recorder is None:
+        recorder = SampleRecorder(keep_samples=True)
+    if targets is None:
+        targets = explorer_targets(explorers, test_data)
+    connections = ['cold', 'warm'] if connection_mode == 'both' else [connection_mode]
+    rng = random.Random(seed)
+    _register_series(recorder, targets, connections)
+
+    throughput = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for connection in connections:
+            sessions = SessionPool(pool_size, block=True) if connection == 'warm' else None
+            try:
+                for target in targets:
+                    print(f"\nDriving {target.name} ({connection}) at {rate:g} req/s "
+                          f"({arrival}) for {duration:g} s...")
+                    result = await _open_loop_target(target, rate, duration, arrival, executor,
+                                                     recorder, sessions, rng)
+                    if result is None:
+                        print("  - no URL can be built for this target, skipped")
+                        continue
+                    print(f"  - sent {result['Sent']}, achieved {result['AchievedRate']:.2f} "
+                          f"of {rate:g} req/s")
+                    throughput.append(result)
+            finally:
+                if sessions is not None:
+                    sessions.close()
+    return recorder, pd.DataFrame(throughput)
+
+def run_tests(concurrency=GLOBAL_CONCURRENCY, per_explorer_concurrency=PER_EXPLORER_CONCURRENCY,
+              connection_mode=CONNECTION_MODE, pool_size=POOL_SIZE, metrics=None):
+    """
+    Runs the performance tests for all explorers and all data types.
+    Progress is counted in metrics (a LiveMetrics), if given.
+    """
+    print("Starting performance analysis...")
+    recorder = asyncio.run(collect_samples(
+        concurrency=concurrency, per_explorer_concurrency=per_explorer_concurrency,
+        connection_mode=connection_mode, pool_size=pool_size,
+        recorder=SampleRecorder(metrics=metrics)))
+    return recorder.summary()
 
 if __name__ == "__main__":
-    performance_data = run_tests()
+    parser = argparse.ArgumentParser(description="Measure block explorer search latency.")
+    parser.add_argument('--matrix', metavar='PATH',
+                        help="Test matrix (.json, .toml, .yaml) replacing EXPLORERS/TEST_DATA")
+    parser.add_argument('--concurrency', type=int,
+                        help="Maximum requests in flight across all explorers "
+                             f"(default: matrix setting or {GLOBAL_CONCURRENCY})")
+    parser.add_argument('--per-explorer-concurrency', type=int,
+                        help="Maximum requests in flight per explorer without its own limit "
+                             f"(default: matrix setting or {PER_EXPLORER_CONCURRENCY})")
+    parser.add_argument('--warmup', type=int,
+                        help="Unrecorded warmup requests per explorer and search type "
+                             f"(default: matrix setting or {NUM_WARMUP})")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Keep sampling each cell until its median is known to within "
+                             "--ci-width, up to --max-runs")
+    parser.add_argument('--ci-width', type=float, default=ADAPTIVE_CI_WIDTH,
+                        help=f"Adaptive target: {ADAPTIVE_CONFIDENCE:.0%}% CI width of the "
+                             "median as a fraction of the median")
+    parser.add_argument('--max-runs', type=int, default=ADAPTIVE_MAX_RUNS,
+                        help="Adaptive run budget per explorer, search type and connection")
+    parser.add_argument('--connection-mode', choices=CONNECTION_MODES, default=CONNECTION_MODE,
+                        help="Fresh connection per request (cold), pooled keep-alive "
+                             "connections (warm), or both")
+    parser.add_argument('--pool-size', type=int, default=POOL_SIZE,
+                        help="Keep-alive connections per explorer host in warm mode")
+    parser.add_argument('--open-loop', action='store_true',
+                        help="Send at a fixed arrival rate instead of one request after another")
+    parser.add_argument('--rate', type=float, default=OPEN_LOOP_RATE,
+                        help="Open-loop target requests per second per explorer")
+    parser.add_argument('--duration', type=float, default=OPEN_LOOP_DURATION,
+                        help="Open-loop seconds per explorer")
+    parser.add_argument('--arrival', choices=ARRIVAL_PROCESSES, default='constant',
+                        help="Open-loop inter-arrival times")
+    parser.add_argument('--stub', nargs='?', const='local', metavar='URL',
+                        help="Target a stub explorer server at URL instead of the live hosts; "
+                             "without URL, start one in-process")
+    parser.add_argument('--stub-seed', type=int, default=42,
+                        help="Seed for the in-process stub server")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve live Prometheus metrics on this local port (/metrics)")
+    parser.add_argument('--metrics-file',
+                        help="Rewrite a JSON snapshot of the live metrics to this file")
+    parser.add_argument('--metrics-interval', type=float, default=SNAPSHOT_INTERVAL,
+                        help="Seconds between --metrics-file snapshots")
+    parser.add_argument('--samples-file', default=SAMPLES_FILE,
+                        help="Per-request samples (.csv, or .parquet for a directory of parts)")
+    parser.add_argument('--batch-size', type=int, default=SAMPLE_BATCH_SIZE,
+                        help="Samples per fsync'd batch")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip runs an interrupted run committed to the samples file's "
+                             f"manifest (<samples file>{MANIFEST_SUFFIX}); failed runs are "
+                             "retried and their failures stay in the error counts")
+    args = parser.parse_args()
+    if args.matrix and args.stub:
+        parser.error("--stub targets the built-in explorers; point the matrix URLs at the stub instead")
+    if args.resume and not args.open_loop and not os.path.exists(manifest_path(args.samples_file)):
+        parser.error(f"--resume needs {manifest_path(args.samples_file)}; "
+                     "without it nothing records which runs were committed")
+
+    settings = {}
+    if args.matrix:
+        targets, settings = load_matrix(args.matrix, NUM_RUNS, NUM_WARMUP)
+    concurrency = args.concurrency or settings.get('concurrency', GLOBAL_CONCURRENCY)
+    per_explorer_concurrency = (args.per_explorer_concurrency
+                                or settings.get('per_target_concurrency', PER_EXPLORER_CONCURRENCY))
+
+    stub_server = None
+    if args.stub == 'local':
+        from stub_explorer import start_stub_server
+        stub_server = start_stub_server(seed=args.stub_seed)
+        targets = explorer_targets(stub_explorers(stub_server.base_url))
+        print(f"Started stub explorer on {stub_server.base_url}")
+    elif args.stub:
+        targets = explorer_targets(stub_explorers(args.stub))
+    elif not args.matrix:
+        targets = explorer_targets()
+    if args.warmup is not None:
+        for target in targets:
+            target.warmup = args.warmup
+
+    metrics = LiveMetrics()
+    metrics_server = snapshot = None
+    if args.metrics_port is not None:
+        metrics_server = serve_metrics(metrics, args.metrics_port)
+        print(f"Live metrics on http://{metrics_server.server_address[0]}:"
+              f"{metrics_server.server_address[1]}/metrics")
+    if args.metrics_file:
+        snapshot = MetricsSnapshot(metrics, args.metrics_file, args.metrics_interval)
+
+    print("Starting performance analysis...")
+    manifest_file = manifest_path(args.samples_file)
+    if args.open_loop:
+        # Open-loop runs cannot be resumed and keep no manifest. The samples
+        # file is rewritten, so a manifest left for it by an earlier run no
+        # longer describes it and would truncate it on a later --resume
+        if os.path.exists(manifest_file):
+            os.remove(manifest_file)
+        manifest_file = None
+    recorder = SampleRecorder(args.samples_file, manifest_file=manifest_file,
+                              resume=args.resume and not args.open_loop,
+                              batch_size=args.batch_size, metrics=metrics)
+    if recorder.done:
+        print(f"Resuming: {len(recorder.done)} runs already recorded")
+    try:
+        if args.open_loop:
+            _, throughput = asyncio.run(run_open_loop(
+                targets=targets, rate=args.rate, duration=args.duration, arrival=args.arrival,
+                connection_mode=args.connection_mode, pool_size=args.pool_size,
+                recorder=recorder))
+            throughput.to_csv(THROUGHPUT_FILE, index=False)
+            print(f"\nThroughput saved to {THROUGHPUT_FILE}")
+            print(throughput)
+        else:
+            asyncio.run(collect_samples(
+                targets=targets, concurrency=concurrency,
+                per_explorer_concurrency=per_explorer_concurrency,
+                connection_mode=args.connection_mode, pool_size=args.pool_size,
+                recorder=recorder, adaptive=args.adaptive, ci_width=args.ci_width,
+                max_runs=args.max_runs))
+    finally:
+        recorder.close()
+        if stub_server is not None:
+            stub_server.shutdown()
+        if snapshot is not None:
+            snapshot.stop()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+    print(f"\nPer-request samples saved to {args.samples_file}")
+    performance_data = recorder.summary()
 
     if not performance_data.empty:
         # Save the results to a CSV file
-        output_file = 'performance_data.csv'
-        performance_data.to_csv(output_file, index=False)
-        print(f"\nPerformance data saved to {output_file}")
+        performance_data.to_csv(OUTPUT_FILE, index=False)
+        print(f"\nPerformance data saved to {OUTPUT_FILE}")
         print("\n--- Results Summary ---")
         print(performance_data)
     else:
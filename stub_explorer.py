@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the block explorers used by performance_analyzer.py.
+
+Serves the three URL shapes the analyzer builds, each as its own route:
+    search   /api/search?q=<value>      (Blockonomics)
+    btc      /btc/<type>/<value>        (Blockchain.com)
+    value    /<value>                   (BTC.com)
+
+Every route has a configurable latency distribution, error rate and
+payload size, so the analyzer can be run offline, in CI or on air-gapped
+machines, and its own overhead can be benchmarked against a known
+server-side latency. A fixed seed makes the injected delays and errors
+repeatable.
+
+Usage:
+    python stub_explorer.py --port 8080 [--config stub.json] [--seed 42]
+    python performance_analyzer.py --stub http://127.0.0.1:8080
+"""
+
+import argparse
+import json
+import math
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# --- Configuration ---
+
+# Latency specs: {'distribution': 'constant', 'ms': x}
+#                {'distribution': 'normal', 'mean_ms': x, 'stddev_ms': y}
+#                {'distribution': 'lognormal', 'median_ms': x, 'sigma': y}
+#                {'distribution': 'exponential', 'mean_ms': x}
+DEFAULT_ROUTES = {
+    'search': {
+        'latency': {'distribution': 'lognormal', 'median_ms': 120, 'sigma': 0.35},
+        'error_rate': 0.01,
+        'error_status': 503,
+        'payload_bytes': 2048
+    },
+    'btc': {
+        'latency': {'distribution': 'lognormal', 'median_ms': 200, 'sigma': 0.5},
+        'error_rate': 0.02,
+        'error_status': 502,
+        'payload_bytes': 48 * 1024
+    },
+    'value': {
+        'latency': {'distribution': 'normal', 'mean_ms': 150, 'stddev_ms': 30},
+        'error_rate': 0.01,
+        'error_status': 500,
+        'payload_bytes': 16 * 1024
+    }
+}
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# --- Main Script ---
+
+def sample_latency(spec, rng):
+    """Draws one server-side delay in milliseconds from a latency spec."""
+    distribution = spec.get('distribution', 'constant')
+    if distribution == 'constant':
+        delay = spec.get('ms', 0)
+    elif distribution == 'normal':
+        delay = rng.gauss(spec['mean_ms'], spec.get('stddev_ms', 0))
+    elif distribution == 'lognormal':
+        delay = rng.lognormvariate(math.log(spec['median_ms']), spec.get('sigma', 0))
+    elif distribution == 'exponential':
+        delay = rng.expovariate(1 / spec['mean_ms'])
+    else:
+        raise ValueError(f"Unknown latency distribution: {distribution!r}")
+    return max(0.0, delay)
+
+
+def match_route(path):
+    """Maps a request path to a route name, or None for unknown shapes."""
+    parts = urlsplit(path)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if parts.path == '/api/search' and parts.query.startswith('q='):
+        return 'search'
+    if len(segments) == 3 and segments[0] == 'btc':
+        return 'btc'
+    if len(segments) == 1:
+        return 'value'
+    return None
+
+
+class StubExplorerHandler(BaseHTTPRequestHandler):
+    """Answers explorer-shaped GET requests with injected delay and errors."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40 ms to every keep-alive request
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        route = match_route(self.path)
+        if route is None:
+            self._respond(404, b'{"error": "not found"}')
+            return
+        config = self.server.routes[route]
+        with self.server.rng_lock:
+            delay = sample_latency(config.get('latency', {}), self.server.rng)
+            failed = self.server.rng.random() < config.get('error_rate', 0)
+        time.sleep(delay / 1000)
+        if failed:
+            self._respond(config.get('error_status', 500), b'{"error": "injected failure"}')
+        else:
+            self._respond(200, self.server.payload(route))
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubExplorerServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the route configuration and seeded RNG."""
+
+    daemon_threads = True
+
+    def __init__(self, address, routes=None, seed=None, verbose=False):
+        super().__init__(address, StubExplorerHandler)
+        self.routes = {name: dict(config) for name, config in DEFAULT_ROUTES.items()}
+        for name, config in (routes or {}).items():
+            self.routes.setdefault(name, {}).update(config)
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.verbose = verbose
+        self._payloads = {}
+
+    def payload(self, route):
+        """Body of payload_bytes for a route, built once and reused."""
+        body = self._payloads.get(route)
+        if body is None:
+            size = self.routes[route].get('payload_bytes', 0)
+            prefix = b'{"route": "' + route.encode() + b'", "pad": "'
+            suffix = b'"}'
+            body = prefix + b'x' * max(0, size - len(prefix) - len(suffix)) + suffix
+            self._payloads[route] = body
+        return body
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(host=DEFAULT_HOST, port=0, routes=None, seed=None):
+    """Starts a stub server in a daemon thread; port 0 picks a free port."""
+    server = StubExplorerServer((host, port), routes, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve explorer-shaped routes locally.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--config', help="JSON file with per-route overrides of DEFAULT_ROUTES")
+    parser.add_argument('--seed', type=int, help="Seed for repeatable delays and errors")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    routes = None
+    if args.config:
+        with open(args.config) as f:
+            routes = json.load(f)
+
+    server = StubExplorerServer((args.host, args.port), routes, args.seed, args.verbose)
+    print(f"Stub explorer serving on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()